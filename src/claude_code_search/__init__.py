@@ -0,0 +1,3 @@
+"""Claude Code transcript search tool."""
+
+__version__ = "0.1.0"
@@ -0,0 +1,6 @@
+"""Entry point for ``python -m claude_code_search``."""
+
+from .cli import cli
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,234 @@
+"""Click command-line interface for claude-code-search."""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import click
+
+from . import __version__
+from .formatters import display_results
+from .index import SearchIndex
+from .loaders import (
+    discover_local_sessions,
+    discover_web_sessions,
+    load_local_session,
+    load_web_session,
+)
+from .server.app import run_server
+
+
+@click.group(invoke_without_command=True)
+@click.version_option(version=__version__, prog_name="claude-code-search")
+@click.pass_context
+def cli(ctx: click.Context) -> None:
+    """Search across Claude Code sessions with full-text indexing."""
+    if ctx.invoked_subcommand is None:
+        ctx.invoke(serve)
+
+
+@cli.command()
+@click.option("--db", default=":memory:", help="Database path")
+@click.option("--port", default=8765, help="Port to serve on")
+@click.option("--host", default="127.0.0.1", help="Host to bind to")
+@click.option("--no-open", is_flag=True, help="Don't open browser")
+@click.option("--reindex", is_flag=True, help="Re-select sessions")
+@click.option("--source", type=click.Choice(["local", "web", "all"]), default="local")
+@click.option("--workers", default=1, help="Worker processes (needs a persistent --db)")
+def serve(
+    db: str,
+    port: int,
+    host: str,
+    no_open: bool,
+    reindex: bool,
+    source: str,
+    workers: int,
+) -> None:
+    """Launch the web UI for searching sessions."""
+    index = SearchIndex(db)
+    needs_indexing = db == ":memory:" or reindex or index.is_empty()
+
+    if needs_indexing:
+        sessions = _discover_sessions(source)
+        if not sessions:
+            click.echo("No sessions found. Exiting.")
+            return
+        selected = _pick_sessions(sessions)
+        if not selected:
+            click.echo("No sessions selected. Exiting.")
+            return
+        _index_sessions(index, selected)
+
+    click.echo(f"\nStarting server at http://{host}:{port}")
+    run_server(
+        index,
+        host=host,
+        port=port,
+        open_browser=not no_open,
+        workers=workers,
+        db_path=None if db == ":memory:" else db,
+    )
+
+
+@cli.command(name="index")
+@click.option("--db", required=True, help="Database path to write")
+@click.option(
+    "--all", "index_all", is_flag=True, help="Index all sessions without prompting"
+)
+@click.option("--source", type=click.Choice(["local", "web", "all"]), default="local")
+@click.option("--append", is_flag=True, help="Append to an existing index")
+def index_cmd(db: str, index_all: bool, source: str, append: bool) -> None:
+    """Build or update the search index."""
+    if not append and Path(db).exists():
+        Path(db).unlink()
+    index = SearchIndex(db)
+    sessions = _discover_sessions(source)
+    if not sessions:
+        click.echo("No sessions found.")
+        return
+    if not index_all:
+        sessions = _pick_sessions(sessions)
+        if not sessions:
+            click.echo("No sessions selected.")
+            return
+    _index_sessions(index, sessions)
+
+
+@cli.command()
+@click.argument("query")
+@click.option("--db", default=None, help="Search an existing database")
+@click.option("--role", default=None, help="Filter by role")
+@click.option("--tool", default=None, help="Filter by tool name")
+@click.option("--session", default=None, help="Filter by session id")
+@click.option("--limit", default=20, help="Maximum results")
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["rich", "table", "json"]),
+    default="rich",
+)
+def search(
+    query: str,
+    db: str | None,
+    role: str | None,
+    tool: str | None,
+    session: str | None,
+    limit: int,
+    output_format: str,
+) -> None:
+    """Full-text search across indexed sessions."""
+    index = _open_or_build(db)
+    results = index.search(query, role=role, tool=tool, session_id=session, limit=limit)
+    display_results(results, format=output_format)
+
+
+@cli.command(name="list")
+@click.option("--db", default=None, help="List sessions from an existing database")
+def list_cmd(db: str | None) -> None:
+    """Show indexed sessions."""
+    index = _open_or_build(db)
+    for session in index.list_sessions():
+        click.echo(
+            f"{session['session_id'][:8]}  "
+            f"{session['message_count']:>5} msgs  "
+            f"{session['last_message_at'] or '-'}"
+        )
+
+
+@cli.command()
+@click.option("--db", default=None, help="Read stats from an existing database")
+def stats(db: str | None) -> None:
+    """Show index statistics."""
+    index = _open_or_build(db)
+    info = index.get_stats()
+    click.echo(f"Sessions indexed: {info['session_count']}")
+    click.echo(f"Total messages: {info['message_count']}")
+    click.echo(f"Tool usages: {info['tool_count']}")
+    click.echo(f"Date range: {info['earliest_message']} to {info['latest_message']}")
+    click.echo(f"Total cost: ${info['total_cost_usd']:.2f}")
+
+
+def _open_or_build(db: str | None) -> SearchIndex:
+    """Open a persistent index, or build an in-memory one from all local sessions."""
+    if db is not None:
+        if not Path(db).exists():
+            click.echo(f"Database not found: {db}", err=True)
+            sys.exit(1)
+        return SearchIndex(db, read_only=True)
+    index = SearchIndex(":memory:")
+    _index_sessions(index, _discover_sessions("local"), quiet=True)
+    return index
+
+
+def _discover_sessions(source: str) -> list[dict[str, Any]]:
+    sessions: list[dict[str, Any]] = []
+    if source in ("local", "all"):
+        sessions.extend(discover_local_sessions())
+    if source in ("web", "all"):
+        sessions.extend(discover_web_sessions())
+    return sessions
+
+
+def _pick_sessions(sessions: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Interactive multi-select over the discovered sessions."""
+    import questionary
+
+    choices = [
+        questionary.Choice(
+            title=(
+                f"{entry['id'][:8]}  {_age(entry['modified'])}  "
+                f'"{entry["preview"][:40]}"  {entry["message_count"]} msgs'
+            ),
+            value=entry["id"],
+            checked=True,
+        )
+        for entry in sessions[:50]
+    ]
+    selected = questionary.checkbox(
+        "Select sessions to index (Space to toggle, Enter to confirm):",
+        choices=choices,
+    ).ask()
+    if not selected:
+        return []
+    chosen = set(selected)
+    return [entry for entry in sessions if entry["id"] in chosen]
+
+
+def _index_sessions(
+    index: SearchIndex, sessions: list[dict[str, Any]], quiet: bool = False
+) -> None:
+    if not quiet:
+        click.echo(f"Indexing {len(sessions)} sessions...")
+    for entry in sessions:
+        if entry.get("source") == "web":
+            messages = load_web_session(entry["id"])
+        else:
+            messages = load_local_session(entry["path"])
+        count = index.index_session(
+            entry["id"],
+            messages,
+            source=entry.get("source", "local"),
+            session_path=entry.get("path"),
+            project_directory=entry.get("project_directory"),
+            defer_fts=True,
+        )
+        if not quiet:
+            click.echo(f"  ✓ {entry['id'][:8]} ({count} messages)")
+    index.finalize_fts()
+    if not quiet:
+        info = index.get_stats()
+        click.echo(
+            f"\nIndex created: {info['message_count']} messages, "
+            f"{info['tool_count']} tool calls"
+        )
+
+
+def _age(mtime: float) -> str:
+    delta = datetime.now() - datetime.fromtimestamp(mtime)
+    if delta.days >= 1:
+        return f"{delta.days}d ago"
+    hours = delta.seconds // 3600
+    if hours:
+        return f"{hours}h ago"
+    return f"{delta.seconds // 60}m ago"
@@ -0,0 +1,86 @@
+"""CLI and export formatting for search results."""
+
+import csv
+import io
+import json
+from typing import Any, Iterator
+
+from rich.console import Console
+from rich.markdown import Markdown
+from rich.panel import Panel
+from rich.table import Table
+
+EXPORT_COLUMNS = (
+    "message_id",
+    "session_id",
+    "role",
+    "timestamp",
+    "content_type",
+    "text_content",
+    "thinking_content",
+    "tool_summary",
+    "score",
+)
+
+
+def display_results(results: list[dict[str, Any]], format: str = "rich") -> None:
+    """Print search results to the terminal."""
+    console = Console()
+
+    if format == "json":
+        console.print_json(format_results(results, "json"))
+        return
+
+    if format == "table":
+        table = Table(title="Search Results")
+        table.add_column("Session", style="cyan")
+        table.add_column("Role", style="magenta")
+        table.add_column("Preview", style="white")
+        table.add_column("Score", style="green")
+        for r in results:
+            preview = (r.get("text_content") or "")[:80]
+            table.add_row(
+                r["session_id"][:8],
+                r["role"],
+                preview,
+                f"{r['score']:.3f}" if r.get("score") is not None else "-",
+            )
+        console.print(table)
+        return
+
+    for r in results:
+        header = f"[cyan]{r['session_id'][:8]}[/] | [magenta]{r['role']}[/] | {r.get('timestamp')}"
+        content = r.get("text_content") or r.get("tool_summary") or ""
+        if len(content) > 500:
+            content = content[:500] + "..."
+        console.print(Panel(Markdown(content), title=header, border_style="blue"))
+
+
+def format_results(results: list[dict[str, Any]], format: str) -> str:
+    """Serialize results to a ``json`` or ``csv`` string."""
+    if format == "csv":
+        return "".join(iter_csv_rows(results))
+    return json.dumps(results, indent=2, default=str)
+
+
+def iter_csv_rows(results: list[dict[str, Any]]) -> Iterator[str]:
+    """Yield CSV lines one at a time, header first.
+
+    Rows can carry multi-KB tool results; yielding per-line lets callers
+    stream the export instead of buffering the whole payload.
+    """
+    yield _csv_line(EXPORT_COLUMNS)
+    for r in results:
+        yield _csv_line([_cell(r.get(col)) for col in EXPORT_COLUMNS])
+
+
+def _csv_line(row: Any) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(row)
+    return buffer.getvalue()
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ""
+    return str(value)
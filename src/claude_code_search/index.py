@@ -0,0 +1,562 @@
+"""DuckDB-backed search index over parsed Claude Code sessions."""
+
+from typing import Any, Iterable
+
+import duckdb
+
+from .parsers import _NON_PROMPT_CTYPES, ParsedMessage, parse_messages
+
+SESSIONS_TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id VARCHAR PRIMARY KEY,
+    source VARCHAR NOT NULL,
+    session_path VARCHAR,
+    project_directory VARCHAR,
+    created_at TIMESTAMP,
+    last_message_at TIMESTAMP,
+    message_count INTEGER,
+    total_cost_usd DECIMAL(10, 6),
+    indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+MESSAGES_TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS messages (
+    message_id VARCHAR PRIMARY KEY,
+    session_id VARCHAR NOT NULL,
+    sequence_num INTEGER NOT NULL,
+    role VARCHAR NOT NULL,
+    timestamp TIMESTAMP,
+    text_content TEXT,
+    thinking_content TEXT,
+    content_type VARCHAR,
+    tool_summary TEXT,
+    cost_usd DECIMAL(10, 6),
+    duration_ms INTEGER,
+    searchable_text TEXT
+)
+"""
+
+# message_id -> interaction mapping, materialized at index time so search
+# grouping never has to re-segment whole sessions per request.
+INTERACTIONS_TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS interactions (
+    message_id VARCHAR PRIMARY KEY,
+    interaction_id VARCHAR NOT NULL,
+    session_id VARCHAR NOT NULL,
+    start_timestamp TIMESTAMP
+)
+"""
+
+TOOL_USAGES_TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS tool_usages (
+    tool_usage_id VARCHAR PRIMARY KEY,
+    message_id VARCHAR NOT NULL,
+    session_id VARCHAR NOT NULL,
+    tool_name VARCHAR NOT NULL,
+    tool_input TEXT,
+    tool_result TEXT,
+    is_error BOOLEAN DEFAULT FALSE,
+    file_path VARCHAR,
+    command VARCHAR
+)
+"""
+
+
+# Columns of the messages table that callers may project in search results.
+MESSAGE_COLUMNS = (
+    "message_id",
+    "session_id",
+    "sequence_num",
+    "role",
+    "timestamp",
+    "text_content",
+    "thinking_content",
+    "content_type",
+    "tool_summary",
+    "cost_usd",
+    "duration_ms",
+    "searchable_text",
+)
+
+
+class SearchIndex:
+    """Full-text search index over sessions, messages and tool usages.
+
+    Backed by DuckDB with the FTS extension; ``db_path=":memory:"`` gives a
+    throwaway in-process index, any other path persists to disk.
+
+    The single connection is shared for the life of the instance, so
+    read-heavy callers never pay per-query connect or catalog setup.
+    Pass ``read_only=True`` when querying an existing database: DuckDB can
+    then map the file without taking the write lock, and several processes
+    can read it concurrently.
+
+    Reads are safe to issue from multiple threads: each query runs on its
+    own cursor, so concurrent callers (the server dispatches handlers to a
+    threadpool) never share the connection's single pending result set.
+    Writes are not synchronized; index while serving at your own risk.
+    """
+
+    def __init__(
+        self,
+        db_path: str = ":memory:",
+        read_only: bool = False,
+        config: dict[str, Any] | None = None,
+    ):
+        self.conn = duckdb.connect(db_path, read_only=read_only, config=config or {})
+        self.read_only = read_only
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        """Initialize the database schema and load the FTS extension."""
+        self.conn.execute("INSTALL fts; LOAD fts;")
+        if not self.read_only:
+            self.conn.execute(SESSIONS_TABLE_DDL)
+            self.conn.execute(MESSAGES_TABLE_DDL)
+            self.conn.execute(TOOL_USAGES_TABLE_DDL)
+            self.conn.execute(INTERACTIONS_TABLE_DDL)
+        # Persistent databases may already carry FTS indexes from a previous
+        # run; querying match_bm25 without one is a catalog error.
+        row = self.conn.execute(
+            "SELECT count(*) FROM duckdb_schemas() WHERE schema_name = 'fts_main_messages'"
+        ).fetchone()
+        self._has_fts = row[0] > 0
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def is_empty(self) -> bool:
+        row = self._fetch_one("SELECT count(*) FROM sessions")
+        return row[0] == 0
+
+    def index_session(
+        self,
+        session_id: str,
+        messages: list[dict[str, Any]],
+        source: str = "local",
+        session_path: str | None = None,
+        project_directory: str | None = None,
+        defer_fts: bool = False,
+    ) -> int:
+        """Parse and index a single session; returns the message count.
+
+        With ``defer_fts=True`` the FTS rebuild is skipped; callers indexing
+        a run of sessions should finish with :meth:`finalize_fts` so the
+        indexes are built once instead of per session.
+        """
+        count = self._index_one(
+            session_id, messages, source, session_path, project_directory
+        )
+        if not defer_fts:
+            self._rebuild_fts()
+        return count
+
+    def finalize_fts(self) -> None:
+        """Build the FTS indexes after deferred :meth:`index_session` calls."""
+        self._rebuild_fts()
+
+    def index_sessions(
+        self, batch: Iterable[tuple[str, list[dict[str, Any]], str]]
+    ) -> int:
+        """Index several sessions with one FTS rebuild at the end.
+
+        ``batch`` holds ``(session_id, messages, source)`` tuples. Rebuilding
+        the FTS indexes is the expensive step, so amortizing it across the
+        batch beats calling :meth:`index_session` per session.
+        """
+        total = 0
+        for session_id, messages, source in batch:
+            total += self._index_one(session_id, messages, source, None, None)
+        self._rebuild_fts()
+        return total
+
+    def _index_one(
+        self,
+        session_id: str,
+        messages: list[dict[str, Any]],
+        source: str,
+        session_path: str | None,
+        project_directory: str | None,
+    ) -> int:
+        parsed = parse_messages(messages, session_id)
+
+        self.conn.execute("DELETE FROM tool_usages WHERE session_id = ?", [session_id])
+        self.conn.execute("DELETE FROM interactions WHERE session_id = ?", [session_id])
+        self.conn.execute("DELETE FROM messages WHERE session_id = ?", [session_id])
+        self.conn.execute("DELETE FROM sessions WHERE session_id = ?", [session_id])
+
+        timestamps = [m.timestamp for m in parsed if m.timestamp]
+        total_cost = sum(m.cost_usd or 0.0 for m in parsed)
+        self.conn.execute(
+            """
+            INSERT INTO sessions (
+                session_id, source, session_path, project_directory,
+                created_at, last_message_at, message_count, total_cost_usd
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                session_id,
+                source,
+                session_path,
+                project_directory,
+                min(timestamps) if timestamps else None,
+                max(timestamps) if timestamps else None,
+                len(parsed),
+                total_cost,
+            ],
+        )
+
+        self._insert_messages(parsed)
+        self._insert_interactions(session_id, parsed)
+        return len(parsed)
+
+    def _insert_interactions(
+        self, session_id: str, parsed: list[ParsedMessage]
+    ) -> None:
+        """Materialize the message -> interaction mapping for one session.
+
+        Rows are accumulated across all interactions and land in a single
+        executemany, matching the bulk path used for messages and tools.
+        """
+        rows: list[list[Any]] = []
+        index = 0
+        current: list[ParsedMessage] = []
+        for message in parsed:
+            is_prompt = (
+                message.role == "user"
+                and message.content_type not in _NON_PROMPT_CTYPES
+            )
+            if is_prompt and current:
+                self._collect_interaction_rows(rows, session_id, current, index)
+                index += 1
+                current = []
+            current.append(message)
+        if current:
+            self._collect_interaction_rows(rows, session_id, current, index)
+        if rows:
+            self.conn.executemany(
+                "INSERT INTO interactions (message_id, interaction_id, session_id, "
+                "start_timestamp) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    @staticmethod
+    def _collect_interaction_rows(
+        rows: list[list[Any]],
+        session_id: str,
+        messages: list[ParsedMessage],
+        index: int,
+    ) -> None:
+        interaction_id = f"{session_id}-i{index}"
+        start_timestamp = messages[0].timestamp
+        for message in messages:
+            rows.append(
+                [message.message_id, interaction_id, session_id, start_timestamp]
+            )
+
+    def _insert_messages(self, parsed: list[ParsedMessage]) -> None:
+        """Bulk-load message and tool rows with one statement per table."""
+        message_rows = []
+        tool_rows = []
+        for message in parsed:
+            message_rows.append(
+                [
+                    message.message_id,
+                    message.session_id,
+                    message.sequence_num,
+                    message.role,
+                    message.timestamp,
+                    message.text_content,
+                    message.thinking_content,
+                    message.content_type,
+                    message.tool_summary,
+                    message.cost_usd,
+                    message.duration_ms,
+                    message.searchable_text,
+                ]
+            )
+            for tool in message.tool_usages:
+                tool_rows.append(
+                    [
+                        tool.tool_usage_id,
+                        tool.message_id,
+                        tool.session_id,
+                        tool.tool_name,
+                        tool.tool_input,
+                        tool.tool_result,
+                        tool.is_error,
+                        tool.file_path,
+                        tool.command,
+                    ]
+                )
+        if message_rows:
+            self.conn.executemany(
+                """
+                INSERT INTO messages (
+                    message_id, session_id, sequence_num, role, timestamp,
+                    text_content, thinking_content, content_type, tool_summary,
+                    cost_usd, duration_ms, searchable_text
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                message_rows,
+            )
+        if tool_rows:
+            self.conn.executemany(
+                """
+                INSERT INTO tool_usages (
+                    tool_usage_id, message_id, session_id, tool_name,
+                    tool_input, tool_result, is_error, file_path, command
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                tool_rows,
+            )
+
+    def _rebuild_fts(self) -> None:
+        """(Re)build the full-text search indexes after a session lands."""
+        self.conn.execute(
+            """
+            PRAGMA create_fts_index(
+                'messages', 'message_id',
+                'text_content', 'thinking_content', 'searchable_text',
+                stemmer='english', stopwords='english', overwrite=1
+            )
+            """
+        )
+        self.conn.execute(
+            """
+            PRAGMA create_fts_index(
+                'tool_usages', 'tool_usage_id',
+                'tool_input', 'tool_result', 'command', 'file_path',
+                stemmer='english', stopwords='english', overwrite=1
+            )
+            """
+        )
+        self._has_fts = True
+
+    def search(
+        self,
+        query: str,
+        role: str | None = None,
+        tool: str | None = None,
+        session_id: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        content_type: str | None = None,
+        limit: int = 20,
+        fields: tuple[str, ...] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Full-text search over messages, ranked by BM25 score.
+
+        ``fields`` projects the result columns in SQL, so multi-KB text
+        columns never leave the database when the caller only needs a
+        subset. Unknown names raise ``ValueError``.
+        """
+        if not self._has_fts:
+            return []
+        if fields:
+            unknown = [name for name in fields if name not in MESSAGE_COLUMNS]
+            if unknown:
+                raise ValueError(f"unknown search fields: {', '.join(unknown)}")
+            select_cols = ", ".join(f"m.{name}" for name in fields) + ", m.score"
+        else:
+            select_cols = "m.*, s.project_directory"
+        sql = f"""
+            WITH matches AS (
+                SELECT *, fts_main_messages.match_bm25(
+                    message_id, ?, fields := 'searchable_text'
+                ) AS score
+                FROM messages
+            )
+            SELECT {select_cols}
+            FROM matches m
+            JOIN sessions s ON m.session_id = s.session_id
+            WHERE m.score IS NOT NULL
+        """
+        params: list[Any] = [query]
+
+        if role:
+            sql += " AND m.role = ?"
+            params.append(role)
+        if session_id:
+            sql += " AND m.session_id = ?"
+            params.append(session_id)
+        if content_type:
+            sql += " AND m.content_type = ?"
+            params.append(content_type)
+        if since:
+            sql += " AND m.timestamp >= ?"
+            params.append(since)
+        if until:
+            sql += " AND m.timestamp <= ?"
+            params.append(until)
+        if tool:
+            sql += """
+                AND m.message_id IN (
+                    SELECT message_id FROM tool_usages WHERE tool_name = ?
+                )
+            """
+            params.append(tool)
+
+        sql += " ORDER BY m.score DESC LIMIT ?"
+        params.append(limit)
+        return self._fetch_dicts(sql, params)
+
+    def search_tools(
+        self,
+        query: str,
+        tool_name: str | None = None,
+        limit: int = 20,
+    ) -> list[dict[str, Any]]:
+        """Full-text search over tool usages."""
+        if not self._has_fts:
+            return []
+        sql = """
+            SELECT *, fts_main_tool_usages.match_bm25(
+                tool_usage_id, ?, fields := 'tool_input,tool_result,command,file_path'
+            ) AS score
+            FROM tool_usages
+            WHERE score IS NOT NULL
+        """
+        params: list[Any] = [query]
+        if tool_name:
+            sql += " AND tool_name = ?"
+            params.append(tool_name)
+        sql += " ORDER BY score DESC LIMIT ?"
+        params.append(limit)
+        return self._fetch_dicts(sql, params)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Aggregate statistics for the whole index."""
+        row = self._fetch_one(
+            """
+            SELECT
+                (SELECT count(*) FROM sessions),
+                (SELECT count(*) FROM messages),
+                (SELECT count(*) FROM tool_usages),
+                (SELECT min(timestamp) FROM messages),
+                (SELECT max(timestamp) FROM messages),
+                (SELECT coalesce(sum(total_cost_usd), 0) FROM sessions)
+            """
+        )
+        return {
+            "session_count": row[0],
+            "message_count": row[1],
+            "tool_count": row[2],
+            "earliest_message": row[3],
+            "latest_message": row[4],
+            "total_cost_usd": float(row[5]),
+        }
+
+    def list_sessions(self) -> list[dict[str, Any]]:
+        return self._fetch_dicts(
+            "SELECT * FROM sessions ORDER BY last_message_at DESC NULLS LAST"
+        )
+
+    def get_session(self, session_id: str) -> dict[str, Any] | None:
+        rows = self._fetch_dicts(
+            "SELECT * FROM sessions WHERE session_id = ?", [session_id]
+        )
+        return rows[0] if rows else None
+
+    def get_sessions_bulk(self, session_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Fetch several session rows in one query, keyed by session id."""
+        if not session_ids:
+            return {}
+        qmarks = ", ".join("?" for _ in session_ids)
+        rows = self._fetch_dicts(
+            f"SELECT * FROM sessions WHERE session_id IN ({qmarks})",
+            list(session_ids),
+        )
+        return {row["session_id"]: row for row in rows}
+
+    def list_messages(self, session_id: str) -> list[dict[str, Any]]:
+        return self._fetch_dicts(
+            "SELECT * FROM messages WHERE session_id = ? ORDER BY sequence_num",
+            [session_id],
+        )
+
+    def map_messages_to_interactions(self, message_ids: list[str]) -> dict[str, str]:
+        """Resolve message ids to their interaction ids from the lookup table."""
+        if not message_ids:
+            return {}
+        qmarks = ", ".join("?" for _ in message_ids)
+        cursor = self.conn.cursor()
+        try:
+            rows = cursor.execute(
+                f"SELECT message_id, interaction_id FROM interactions "
+                f"WHERE message_id IN ({qmarks})",
+                list(message_ids),
+            ).fetchall()
+        finally:
+            cursor.close()
+        return dict(rows)
+
+    def get_interaction_summaries(
+        self, interaction_ids: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Summarize interactions (prompt, span, size) straight from SQL."""
+        if not interaction_ids:
+            return {}
+        qmarks = ", ".join("?" for _ in interaction_ids)
+        rows = self._fetch_dicts(
+            f"""
+            SELECT i.interaction_id,
+                   any_value(i.session_id) AS session_id,
+                   arg_min(m.text_content, m.sequence_num) AS user_prompt,
+                   min(i.start_timestamp) AS started_at,
+                   count(*) AS message_count
+            FROM interactions i
+            JOIN messages m ON m.message_id = i.message_id
+            WHERE i.interaction_id IN ({qmarks})
+            GROUP BY i.interaction_id
+            """,
+            list(interaction_ids),
+        )
+        return {row["interaction_id"]: row for row in rows}
+
+    def get_message(self, message_id: str) -> dict[str, Any] | None:
+        rows = self._fetch_dicts(
+            "SELECT * FROM messages WHERE message_id = ?", [message_id]
+        )
+        return rows[0] if rows else None
+
+    def get_message_with_context(
+        self, message_id: str, before: int = 2, after: int = 2
+    ) -> dict[str, Any] | None:
+        """Return a message plus its surrounding conversation turns."""
+        message = self.get_message(message_id)
+        if message is None:
+            return None
+        seq = message["sequence_num"]
+        context = self._fetch_dicts(
+            """
+            SELECT * FROM messages
+            WHERE session_id = ? AND sequence_num BETWEEN ? AND ?
+            ORDER BY sequence_num
+            """,
+            [message["session_id"], seq - before, seq + after],
+        )
+        return {"message": message, "context": context}
+
+    def _fetch_one(self, sql: str, params: list[Any] | None = None) -> Any:
+        cursor = self.conn.cursor()
+        try:
+            return cursor.execute(sql, params or []).fetchone()
+        finally:
+            cursor.close()
+
+    def _fetch_dicts(
+        self, sql: str, params: list[Any] | None = None
+    ) -> list[dict[str, Any]]:
+        # Every read gets its own cursor. The shared connection holds a
+        # single pending result, so two threads interleaving execute() and
+        # fetchall() on it would steal each other's rows; cursors carry
+        # independent result sets and are cheap to open.
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(sql, params or [])
+            columns = [desc[0] for desc in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
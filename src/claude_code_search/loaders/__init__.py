@@ -0,0 +1,16 @@
+"""Session loaders for local files and the Claude web API."""
+
+from claude_code_search.loaders.local import discover_local_sessions, load_local_session
+from claude_code_search.loaders.web import (
+    discover_web_sessions,
+    fetch_web_sessions,
+    load_web_session,
+)
+
+__all__ = [
+    "discover_local_sessions",
+    "discover_web_sessions",
+    "fetch_web_sessions",
+    "load_local_session",
+    "load_web_session",
+]
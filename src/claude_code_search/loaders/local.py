@@ -0,0 +1,235 @@
+"""Discover and load Claude Code sessions stored under ``~/.claude``."""
+
+import mmap
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+_HOME = Path.home()
+
+LOCAL_SESSIONS_DIR = _HOME / ".claude" / "sessions"
+LOCAL_PROJECTS_DIR = _HOME / ".claude" / "projects"
+DISCOVERY_CACHE_PATH = _HOME / ".cache" / "claude_code_search" / "discovery.json"
+
+
+def discover_local_sessions(
+    sessions_dir: Path | None = None,
+    projects_dir: Path | None = None,
+    cache_path: Path | None = None,
+) -> list[dict[str, Any]]:
+    """Find all local Claude Code sessions, newest first.
+
+    Results are cached on disk keyed by the mtimes of the two root
+    directories plus each project subdirectory, so a warm CLI start costs
+    one ``stat()`` per project instead of a full rescan. New or removed
+    session files bump their parent directory's mtime and invalidate the
+    cache; in-place appends to an existing session file do not, which is
+    acceptable for the preview/count metadata cached here. Caching is only
+    enabled by default when scanning the real ``~/.claude`` roots.
+    """
+    default_roots = sessions_dir is None and projects_dir is None
+    sessions_dir = sessions_dir if sessions_dir is not None else LOCAL_SESSIONS_DIR
+    projects_dir = projects_dir if projects_dir is not None else LOCAL_PROJECTS_DIR
+    if cache_path is None and default_roots:
+        cache_path = DISCOVERY_CACHE_PATH
+
+    roots = [str(sessions_dir), str(projects_dir)]
+    fingerprint = _roots_fingerprint(sessions_dir, projects_dir)
+    if cache_path is not None:
+        cached = _read_discovery_cache(cache_path)
+        if (
+            cached is not None
+            and cached.get("roots") == roots
+            and cached.get("fingerprint") == fingerprint
+        ):
+            return cached["entries"]
+
+    sessions: list[dict[str, Any]] = []
+
+    if sessions_dir.is_dir():
+        for session_dir in sessions_dir.iterdir():
+            if not session_dir.is_dir():
+                continue
+            messages_file = session_dir / "messages.jsonl"
+            if messages_file.exists():
+                sessions.append(_session_entry(session_dir.name, messages_file))
+
+    if projects_dir.is_dir():
+        for project_dir in projects_dir.iterdir():
+            if not project_dir.is_dir():
+                continue
+            for jsonl_file in project_dir.glob("*.jsonl"):
+                if _is_session_jsonl(jsonl_file):
+                    entry = _session_entry(jsonl_file.stem, jsonl_file)
+                    entry["project_directory"] = project_dir.name
+                    sessions.append(entry)
+
+    sessions.sort(key=lambda s: s["modified"], reverse=True)
+    if cache_path is not None:
+        _write_discovery_cache(cache_path, roots, fingerprint, sessions)
+    return sessions
+
+
+def _dir_mtime_ns(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _roots_fingerprint(sessions_dir: Path, projects_dir: Path) -> list[int | None]:
+    """Mtimes of both roots plus every project subdirectory.
+
+    A new session file in an existing project bumps that project dir's
+    mtime, not the root's, so the roots alone would serve stale listings
+    forever. Session dirs don't need this: a new local session is a new
+    subdirectory, which does bump ``sessions_dir``.
+    """
+    fingerprint = [_dir_mtime_ns(sessions_dir), _dir_mtime_ns(projects_dir)]
+    if projects_dir.is_dir():
+        for project_dir in sorted(projects_dir.iterdir()):
+            if project_dir.is_dir():
+                fingerprint.append(_dir_mtime_ns(project_dir))
+    return fingerprint
+
+
+def _read_discovery_cache(cache_path: Path) -> dict[str, Any] | None:
+    try:
+        cached = orjson.loads(cache_path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    return cached if isinstance(cached, dict) else None
+
+
+def _write_discovery_cache(
+    cache_path: Path,
+    roots: list[str],
+    fingerprint: list[int | None],
+    entries: list[dict[str, Any]],
+) -> None:
+    payload = {"roots": roots, "fingerprint": fingerprint, "entries": entries}
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(orjson.dumps(payload))
+    except OSError:
+        pass
+
+
+def _session_entry(session_id: str, path: Path) -> dict[str, Any]:
+    preview, message_count = _extract_preview(path)
+    return {
+        "id": session_id,
+        "path": str(path),
+        "source": "local",
+        "modified": path.stat().st_mtime,
+        "preview": preview,
+        "message_count": message_count,
+    }
+
+
+def _is_session_jsonl(path: Path) -> bool:
+    """Check whether a ``.jsonl`` file looks like a Claude Code session.
+
+    Session messages always carry a ``message`` or ``uuid`` key, so a bytes
+    substring probe over the first 4 KB settles the common case without
+    reading or JSON-parsing the whole file. Only when the probe is
+    inconclusive do we fall back to parsing the first line.
+    """
+    try:
+        with path.open("rb") as f:
+            head = f.read(4096)
+    except OSError:
+        return False
+    if b'"message"' in head or b'"uuid"' in head:
+        return True
+    first_line = head.split(b"\n", 1)[0].strip()
+    if not first_line:
+        return False
+    try:
+        record = orjson.loads(first_line)
+    except orjson.JSONDecodeError:
+        return False
+    return isinstance(record, dict) and ("message" in record or "uuid" in record)
+
+
+def _extract_preview(path: Path) -> tuple[str, int]:
+    """Return a one-line preview of the first message and the line count.
+
+    Only the first 8 KB are read (and parsed) for the preview — session
+    files can run to tens of megabytes and the preview needs just the first
+    message. The count comes from :func:`_count_lines`. A first line longer
+    than 8 KB yields an empty preview.
+    """
+    try:
+        with path.open("rb") as f:
+            head = f.read(8192)
+        if not head:
+            return "", 0
+        count = _count_lines(path)
+    except OSError:
+        return "", 0
+
+    preview = ""
+    for line in head.split(b"\n"):
+        if line.strip():
+            try:
+                preview = _extract_preview_text(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                pass
+            break
+    return preview, count
+
+
+def _count_lines(path: Path) -> int:
+    """Count lines by mmap-ing the file and counting newlines.
+
+    ``bytes.count`` over 1 MB windows of the map is a C-level memchr-style
+    scan, so this runs at memory bandwidth without materializing line
+    objects.
+    """
+    with path.open("rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                count = 0
+                for offset in range(0, len(mm), 1 << 20):
+                    count += mm[offset : offset + (1 << 20)].count(b"\n")
+                if mm[-1:] != b"\n":
+                    count += 1
+                return count
+        except ValueError:  # empty files cannot be mapped
+            return 0
+
+
+def _extract_preview_text(raw: dict[str, Any]) -> str:
+    """Pull the first chunk of user-visible text out of a raw message."""
+    content = raw.get("message", {}).get("content", "")
+    if isinstance(content, str):
+        return content[:80]
+    if isinstance(content, list):
+        for block in content:
+            if isinstance(block, dict) and block.get("type") == "text":
+                return block.get("text", "")[:80]
+    return ""
+
+
+def load_local_session(path: str | Path) -> list[dict[str, Any]]:
+    """Load all messages from a local session JSONL file.
+
+    Lines that fail to parse are skipped; interrupted sessions can leave a
+    truncated trailing line behind.
+
+    The whole file is read in one call and split on newlines at C level;
+    each line is handed to orjson as bytes, so the decoder materializes
+    strings straight from the raw buffer with no per-line str decode or
+    Python-level stripping.
+    """
+    messages: list[dict[str, Any]] = []
+    for line in Path(path).read_bytes().splitlines():
+        if not line:
+            continue
+        try:
+            messages.append(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            continue
+    return messages
@@ -0,0 +1,130 @@
+"""Load sessions from Claude Code for web via the Anthropic API."""
+
+import functools
+import json
+import os
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import httpx
+import orjson
+
+_HOME = Path.home()
+
+API_BASE_URL = "https://api.anthropic.com"
+ANTHROPIC_VERSION = "2023-06-01"
+
+# Shared client so sequential requests reuse the same TCP+TLS connection
+# instead of paying a fresh handshake per call.
+_CLIENT = httpx.Client(base_url=API_BASE_URL, timeout=30.0)
+
+
+@functools.cache
+def get_oauth_token() -> str:
+    """Extract the OAuth token from the macOS Keychain.
+
+    Cached for the process lifetime: every call otherwise forks
+    ``security find-generic-password``, which costs tens of milliseconds.
+    """
+    result = subprocess.run(
+        [
+            "security",
+            "find-generic-password",
+            "-a",
+            os.environ["USER"],
+            "-w",
+            "-s",
+            "Claude Code-credentials",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    creds = json.loads(result.stdout)
+    return creds["claudeAiOauth"]["accessToken"]
+
+
+# (mtime_ns of ~/.claude.json, org uuid) from the last successful read.
+_org_uuid_cache: tuple[int, str] | None = None
+
+
+def get_org_uuid() -> str:
+    """Get the organization UUID from the Claude config file.
+
+    The config is re-read only when its mtime changes, so repeated calls
+    cost a single ``stat()`` instead of a read + JSON parse.
+    """
+    global _org_uuid_cache
+    config_path = _HOME / ".claude.json"
+    mtime_ns = config_path.stat().st_mtime_ns
+    if _org_uuid_cache is not None and _org_uuid_cache[0] == mtime_ns:
+        return _org_uuid_cache[1]
+    config = json.loads(config_path.read_text())
+    org_uuid = config["oauthAccount"]["organizationUuid"]
+    _org_uuid_cache = (mtime_ns, org_uuid)
+    return org_uuid
+
+
+def _auth_headers() -> dict[str, str]:
+    return {
+        "Authorization": f"Bearer {get_oauth_token()}",
+        "anthropic-version": ANTHROPIC_VERSION,
+        "x-organization-uuid": get_org_uuid(),
+    }
+
+
+def fetch_web_sessions() -> list[dict[str, Any]]:
+    """Fetch the list of sessions from Claude Code for web."""
+    response = _CLIENT.get("/v1/sessions", headers=_auth_headers())
+    response.raise_for_status()
+    return response.json()["sessions"]
+
+
+def discover_web_sessions() -> list[dict[str, Any]]:
+    """Fetch web sessions normalized to the local discovery-entry shape.
+
+    The CLI's selection and indexing paths consume the entry dicts that
+    :func:`discover_local_sessions` produces, so the raw API records are
+    mapped onto the same keys here. Web entries have no local path; they
+    are loaded by id via :func:`load_web_session`.
+    """
+    return [
+        {
+            "id": raw.get("id") or raw.get("uuid", ""),
+            "path": None,
+            "source": "web",
+            "modified": _entry_mtime(raw.get("updated_at") or raw.get("created_at")),
+            "preview": (raw.get("name") or raw.get("summary") or "")[:80],
+            "message_count": raw.get("message_count", 0),
+        }
+        for raw in fetch_web_sessions()
+    ]
+
+
+def _entry_mtime(value: Any) -> float:
+    """Coerce an API timestamp (ISO string or epoch) to epoch seconds."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return 0.0
+    return 0.0
+
+
+def load_web_session(session_id: str) -> list[dict[str, Any]]:
+    """Load all messages for a single web session.
+
+    The messages payload for a long session can run to tens of megabytes, so
+    stream the body in chunks instead of buffering it through ``response.json()``
+    and decode once with orjson.
+    """
+    url = f"/v1/sessions/{session_id}/messages"
+    with _CLIENT.stream("GET", url, headers=_auth_headers()) as response:
+        response.raise_for_status()
+        chunks = [chunk for chunk in response.iter_bytes(65536)]
+    payload = orjson.loads(b"".join(chunks))
+    return payload["messages"]
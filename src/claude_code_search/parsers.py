@@ -0,0 +1,582 @@
+"""Parse raw session messages into typed records.
+
+Turns the JSON dicts stored in session files into the dataclasses the
+index consumes — flattened messages, tool usages and interactions — and
+extracts commit intents and commit lines from Bash tool usage along the
+way.
+"""
+
+import itertools
+import math
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Callable, Final, Iterable, Iterator
+
+import orjson
+
+try:  # optional accelerator, see the `hyperscan` extra
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+
+# Commit extraction patterns, compiled once: the quoted form of
+# `git commit -m`, and the `[branch hash] message` line git prints on success.
+# The heredoc form is handled by a hand-written scan in
+# _extract_heredoc_commit; the regex equivalent needs nested lazy
+# quantifiers under DOTALL, which backtracks quadratically on adversarial
+# commands.
+_SIMPLE_COMMIT_RE: Final = re.compile(r'git\s+commit\s+.*?-m\s+["\']([^"\']+)["\']')
+_COMMIT_LINE_RE: Final = re.compile(
+    r"\[([\w\s/-]+)\s+([0-9a-f]{7,40})\]\s+(.+?)(?:\n|$)"
+)
+
+# Collapses line-structure whitespace in one translate() pass when building
+# 80-char previews, instead of chaining replace() allocations.
+_NEWLINE_TO_SPACE: Final = str.maketrans({"\n": " ", "\r": " ", "\t": " "})
+
+# Interned content-type constants: every ParsedMessage stores one of these
+# five values, and downstream == / `in` checks hit the pointer-equality fast
+# path when both sides are the interned instance.
+_CT_TEXT: Final = sys.intern("text")
+_CT_TOOL_USE: Final = sys.intern("tool_use")
+_CT_TOOL_RESULT: Final = sys.intern("tool_result")
+_CT_THINKING: Final = sys.intern("thinking")
+_CT_SYSTEM: Final = sys.intern("system")
+
+# Content types that never start a new interaction.
+_NON_PROMPT_CTYPES: Final = frozenset({_CT_TOOL_RESULT, _CT_SYSTEM})
+
+
+@dataclass(slots=True)
+class Commit:
+    """A commit reported in a tool result (``[branch hash] message``)."""
+
+    branch: str
+    # Stored as ASCII bytes: a bytes object is leaner than str and commit
+    # hashes are only ever displayed, not manipulated.
+    commit_hash: bytes
+    message: str
+
+    @property
+    def commit_hash_str(self) -> str:
+        return self.commit_hash.decode("ascii")
+
+
+@dataclass(slots=True)
+class ToolUsage:
+    """A single tool invocation within a message."""
+
+    tool_usage_id: str | None
+    message_id: str
+    session_id: str
+    tool_name: str | None
+    tool_input: str
+    tool_result: str | None = None
+    is_error: bool = False
+    file_path: str | None = None
+    command: str | None = None
+    commit_intent: str | None = None
+
+
+@dataclass(slots=True)
+class ParsedMessage:
+    """One conversation turn, flattened for indexing."""
+
+    message_id: str
+    session_id: str
+    sequence_num: int
+    role: str
+    timestamp: str | None
+    text_content: str
+    thinking_content: str | None
+    searchable_text: str
+    content_type: str
+    tool_summary: str
+    cost_usd: float | None
+    duration_ms: int | None
+    tool_usages: list[ToolUsage] = field(default_factory=list)
+    commits: list[Commit] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Interaction:
+    """A user prompt plus everything that happened until the next prompt."""
+
+    interaction_id: str
+    session_id: str
+    user_prompt: str
+    messages: list[ParsedMessage]
+    tool_calls: list[str]
+    total_cost_usd: float
+    started_at: str | None
+    ended_at: str | None
+
+
+# Specialized (file_path, command) extractors, built on first sighting of a
+# tool name. Most sessions are dominated by a handful of tools (Read, Edit,
+# Bash), so a cached per-tool closure replaces the generic two-key ``or``
+# chain and the per-block Bash name comparison.
+_TOOL_EXTRACTORS: Final[
+    dict[str, Callable[[dict[str, Any]], tuple[str | None, str | None]]]
+] = {}
+
+
+def _make_tool_extractor(
+    tool_name: str, tool_input: dict[str, Any]
+) -> Callable[[dict[str, Any]], tuple[str | None, str | None]]:
+    if tool_name.lower() == "bash":
+        return lambda inp: (None, inp.get("command"))
+    if "file_path" in tool_input:
+        return lambda inp: (inp.get("file_path"), None)
+    if "path" in tool_input:
+        return lambda inp: (inp.get("path"), None)
+    return lambda inp: (inp.get("path") or inp.get("file_path"), None)
+
+
+def _extract_tool_fields(
+    tool_name: str | None, tool_input: dict[str, Any]
+) -> tuple[str | None, str | None]:
+    """Extract (file_path, command) from a tool_use input."""
+    if not tool_name:
+        return tool_input.get("path") or tool_input.get("file_path"), None
+    extractor = _TOOL_EXTRACTORS.get(tool_name)
+    if extractor is None:
+        extractor = _make_tool_extractor(tool_name, tool_input)
+        _TOOL_EXTRACTORS[tool_name] = extractor
+    return extractor(tool_input)
+
+
+def _extract_commit_intent(command: str) -> str | None:
+    """Pull the intended commit message out of a ``git commit`` command."""
+    # Almost no Bash commands are commits; a C-level substring test is far
+    # cheaper than letting the backtracking patterns reject long commands.
+    if "git commit" not in command:
+        return None
+    heredoc = _extract_heredoc_commit(command)
+    if heredoc is not None:
+        return heredoc
+    if "-m" not in command:
+        return None
+    simple = _SIMPLE_COMMIT_RE.search(command)
+    if simple:
+        return simple.group(1).strip()
+    return None
+
+
+def _extract_heredoc_commit(command: str) -> str | None:
+    """Extract the first line of a heredoc commit message.
+
+    A linear sequence of ``str.find`` calls: locate the heredoc opener,
+    skip to the end of its line, then take everything up to the EOF
+    terminator. O(n) on any input, unlike the regex formulation.
+    """
+    idx = command.find('-m "$(cat <<')
+    if idx == -1:
+        return None
+    nl = command.find("\n", idx)
+    if nl == -1:
+        return None
+    end = command.find("\nEOF", nl)
+    if end == -1:
+        end = command.find("\n\tEOF", nl)
+    if end == -1:
+        return None
+    body = command[nl + 1 : end]
+    if not body.strip():
+        return None
+    return body.split("\n", 1)[0].strip()
+
+
+# SIMD-accelerated prefilter for commit lines. Hyperscan only reports match
+# spans, so the Python pattern still runs on each (tiny) span to pull out the
+# groups; the bulk of the body never touches the backtracking engine.
+_HS_DB = None
+if hyperscan is not None:
+    _HS_DB = hyperscan.Database()
+    _HS_DB.compile(
+        expressions=[rb"\[[\w\s/-]+\s+[0-9a-f]{7,40}\]\s+[^\n]+"],
+        flags=[hyperscan.HS_FLAG_SOM_LEFTMOST],
+    )
+
+
+def _extract_commits_hyperscan(result_content: str) -> list[Commit]:
+    data = result_content.encode()
+    starts: dict[int, int] = {}
+
+    def _on_match(_id: int, start: int, end: int, _flags: int, _ctx: object) -> None:
+        # Hyperscan reports every end position; keep the longest span per start.
+        if end > starts.get(start, -1):
+            starts[start] = end
+
+    _HS_DB.scan(data, match_event_handler=_on_match)
+    commits = []
+    for start in sorted(starts):
+        match = _COMMIT_LINE_RE.match(data[start : starts[start]].decode())
+        if match:
+            commits.append(
+                Commit(
+                    branch=match.group(1).strip(),
+                    commit_hash=match.group(2).encode("ascii"),
+                    message=match.group(3).strip(),
+                )
+            )
+    return commits
+
+
+def _extract_commits_from_result(result_content: str) -> list[Commit]:
+    """Extract ``[branch hash] message`` commit lines from a tool result."""
+    if "[" not in result_content:
+        return []
+    if _HS_DB is not None:
+        return _extract_commits_hyperscan(result_content)
+    commits = []
+    for match in _COMMIT_LINE_RE.finditer(result_content):
+        commits.append(
+            Commit(
+                branch=match.group(1).strip(),
+                commit_hash=match.group(2).encode("ascii"),
+                message=match.group(3).strip(),
+            )
+        )
+    return commits
+
+
+def _tool_summary_part(tool: ToolUsage) -> str:
+    if tool.command:
+        return f"{tool.tool_name}: {tool.command[:60]}"
+    if tool.file_path:
+        return f"{tool.tool_name}: {tool.file_path}"
+    return tool.tool_name or "tool"
+
+
+def _determine_content_type(
+    role: str,
+    has_text: bool,
+    tool_usages: list[ToolUsage],
+    tool_results: list[str],
+    thinking_content: str | None,
+    summary_parts: list[str],
+) -> tuple[str, str]:
+    """Classify a message and build a short human-readable summary.
+
+    Pure dispatch on flags gathered during the single content walk in
+    `parse_message`; no second pass over the blocks happens here.
+    """
+    if role == "system":
+        return _CT_SYSTEM, ""
+    if tool_usages:
+        return _CT_TOOL_USE, ", ".join(summary_parts)
+    if tool_results:
+        preview = tool_results[0][:80].translate(_NEWLINE_TO_SPACE).strip()
+        return _CT_TOOL_RESULT, preview
+    if has_text:
+        return _CT_TEXT, ""
+    if thinking_content:
+        return _CT_THINKING, thinking_content[:80].translate(_NEWLINE_TO_SPACE).strip()
+    return _CT_SYSTEM, ""
+
+
+class _ParseState:
+    """Mutable accumulator threaded through the per-block handlers."""
+
+    __slots__ = (
+        "message_id",
+        "session_id",
+        "text_parts",
+        "all_thinking",
+        "tool_usages",
+        "tool_results",
+        "commits",
+        "has_text",
+        "summary_parts",
+    )
+
+    def __init__(self, message_id: str, session_id: str) -> None:
+        self.message_id = message_id
+        self.session_id = session_id
+        self.text_parts: list[str] = []
+        self.all_thinking: list[str] = []
+        self.tool_usages: list[ToolUsage] = []
+        self.tool_results: list[str] = []
+        self.commits: list[Commit] = []
+        self.has_text = False
+        self.summary_parts: list[str] = []
+
+
+def _handle_text(block: dict[str, Any], state: _ParseState) -> None:
+    text = block.get("text", "")
+    state.text_parts.append(text)
+    # isspace() short-circuits at the first real character and never copies,
+    # unlike strip(), which would duplicate the block just to test emptiness.
+    if not state.has_text and text and not text.isspace():
+        state.has_text = True
+
+
+def _handle_thinking(block: dict[str, Any], state: _ParseState) -> None:
+    state.all_thinking.append(block.get("thinking", ""))
+
+
+def _handle_tool_use(block: dict[str, Any], state: _ParseState) -> None:
+    tool_name = block.get("name")
+    if isinstance(tool_name, str):
+        # Like roles, tool names draw from a handful of values repeated
+        # across thousands of blocks; interning shares one instance each.
+        tool_name = sys.intern(tool_name)
+    tool_input = block.get("input", {})
+    file_path, command = _extract_tool_fields(tool_name, tool_input)
+    state.tool_usages.append(
+        ToolUsage(
+            tool_usage_id=block.get("id"),
+            message_id=state.message_id,
+            session_id=state.session_id,
+            tool_name=tool_name,
+            tool_input=orjson.dumps(tool_input).decode(),
+            file_path=file_path,
+            command=command,
+            commit_intent=_extract_commit_intent(command) if command else None,
+        )
+    )
+    if len(state.summary_parts) < 3:
+        state.summary_parts.append(_tool_summary_part(state.tool_usages[-1]))
+
+
+def _handle_tool_result(block: dict[str, Any], state: _ParseState) -> None:
+    result_content = block.get("content", "")
+    if isinstance(result_content, list):
+        # A list comprehension lets join size its buffer in one pass instead
+        # of materializing the generator into a temporary sequence first.
+        result_content = "\n".join(
+            [part.get("text", "") for part in result_content if isinstance(part, dict)]
+        )
+    result_str = (
+        result_content if isinstance(result_content, str) else str(result_content)
+    )
+    state.tool_results.append(result_str)
+    state.commits.extend(_extract_commits_from_result(result_str))
+    tool_id = block.get("tool_use_id")
+    for tool in state.tool_usages:
+        if tool.tool_usage_id == tool_id:
+            tool.tool_result = result_str
+            tool.is_error = bool(block.get("is_error", False))
+
+
+# Block-type dispatch: one O(1) dict probe per block instead of a four-way
+# string-compare chain, with the handlers hoisted to module level.
+_BLOCK_DISPATCH: Final[dict[str, Callable[[dict[str, Any], _ParseState], None]]] = {
+    "text": _handle_text,
+    "thinking": _handle_thinking,
+    "tool_use": _handle_tool_use,
+    "tool_result": _handle_tool_result,
+}
+
+
+def parse_message(raw: dict[str, Any], session_id: str, seq: int) -> ParsedMessage:
+    """Parse a raw session message into a :class:`ParsedMessage`.
+
+    ``thinking_content`` joins thinking blocks in content order, followed
+    by any top-level ``thinking`` field, separated by newlines;
+    ``searchable_text`` appends the thinking parts after the text parts in
+    the same way. Callers may rely on that ordering.
+    """
+    message_id = raw.get("uuid", f"{session_id}-{seq}")
+    message_block = raw.get("message") or {}
+    role = message_block.get("role", raw.get("type", "unknown"))
+    if isinstance(role, str):
+        # Role values repeat across every message of a session; interning
+        # collapses them to shared instances with pointer-fast comparison.
+        role = sys.intern(role)
+
+    state = _ParseState(message_id, session_id)
+    content = message_block.get("content", [])
+    if isinstance(content, str):
+        state.text_parts.append(content)
+        state.has_text = bool(content) and not content.isspace()
+    elif isinstance(content, list):
+        dispatch_get = _BLOCK_DISPATCH.get
+        for block in content:
+            if not isinstance(block, dict):
+                continue
+            handler = dispatch_get(block.get("type"))
+            if handler is not None:
+                handler(block, state)
+
+    if raw.get("thinking"):
+        state.all_thinking.append(raw["thinking"])
+
+    text_parts = state.text_parts
+    all_thinking = state.all_thinking
+    tool_usages = state.tool_usages
+    tool_results = state.tool_results
+    commits = state.commits
+    has_text = state.has_text
+    summary_parts = state.summary_parts
+
+    # Most messages have zero or one text part; skip the join (and its copy)
+    # for those.
+    if not text_parts:
+        text_content = ""
+    elif len(text_parts) == 1:
+        text_content = text_parts[0]
+    else:
+        text_content = "\n".join(text_parts)
+    thinking_content = "\n".join(filter(None, all_thinking)) or None
+    if thinking_content is None:
+        searchable_text = text_content
+    elif not text_content:
+        searchable_text = thinking_content
+    else:
+        # Join once from the original parts; joining the two already-joined
+        # strings would copy every byte a second time.
+        searchable_text = "\n".join(
+            part for part in itertools.chain(text_parts, all_thinking) if part
+        )
+
+    content_type, tool_summary = _determine_content_type(
+        role, has_text, tool_usages, tool_results, thinking_content, summary_parts
+    )
+
+    return ParsedMessage(
+        message_id=message_id,
+        session_id=session_id,
+        sequence_num=seq,
+        role=role,
+        timestamp=raw.get("timestamp"),
+        text_content=text_content,
+        thinking_content=thinking_content,
+        searchable_text=searchable_text,
+        content_type=content_type,
+        tool_summary=tool_summary,
+        cost_usd=raw.get("costUSD"),
+        duration_ms=raw.get("durationMs"),
+        tool_usages=tool_usages,
+        commits=commits,
+    )
+
+
+def parse_message_json(
+    raw_bytes: bytes | str, session_id: str, seq: int
+) -> ParsedMessage:
+    """Parse one raw JSONL line straight from bytes.
+
+    orjson decodes directly from the raw buffer, so callers holding file
+    bytes skip the str round trip a separate loads + parse would pay.
+    """
+    return parse_message(orjson.loads(raw_bytes), session_id, seq)
+
+
+def parse_messages(
+    messages: Iterable[dict[str, Any]], session_id: str
+) -> list[ParsedMessage]:
+    """Parse a whole session in order, assigning sequence numbers.
+
+    The session id is interned once up front (every ParsedMessage carries
+    it) and the parser is bound locally, keeping repeated lookups out of
+    the per-message loop.
+    """
+    sid = sys.intern(session_id)
+    parser = parse_message
+    return [parser(raw, sid, seq) for seq, raw in enumerate(messages)]
+
+
+# Below this many lines the pool spawn cost outweighs the parallel win.
+_PARALLEL_MIN_LINES: Final = 2000
+
+
+def _parse_indexed_line(args: tuple[bytes | str, str, int]) -> ParsedMessage:
+    line, session_id, seq = args
+    return parse_message_json(line, session_id, seq)
+
+
+def parse_messages_parallel(
+    lines: Iterable[bytes | str], session_id: str, workers: int | None = None
+) -> list[ParsedMessage]:
+    """Parse raw JSONL lines into messages, fanning out across processes.
+
+    Each line is independent, so decoding + parsing shards cleanly; results
+    come back in order via ``executor.map``. Small sessions (or
+    ``workers=1``) take the serial path since pool startup dominates there.
+    """
+    # Imported here, not at module level: pulling in ProcessPoolExecutor
+    # drags the whole multiprocessing machinery into every import of this
+    # module, and most callers never take the parallel path.
+    from concurrent.futures import ProcessPoolExecutor
+
+    lines = lines if isinstance(lines, list) else list(lines)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(lines) < _PARALLEL_MIN_LINES:
+        return [
+            parse_message_json(line, session_id, seq) for seq, line in enumerate(lines)
+        ]
+    chunksize = max(1, len(lines) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                _parse_indexed_line,
+                ((line, session_id, seq) for seq, line in enumerate(lines)),
+                chunksize=chunksize,
+            )
+        )
+
+
+def group_messages_into_interactions(
+    messages: Iterable[dict[str, Any]], session_id: str
+) -> Iterator[Interaction]:
+    """Group raw messages into interactions, split at each user prompt.
+
+    Yields each :class:`Interaction` as soon as its boundary is seen, so
+    callers can consume a large session without the whole grouping being
+    resident; wrap with ``list(...)`` where a list is needed.
+    """
+    index = 0
+    current: list[ParsedMessage] = []
+    for seq, raw_msg in enumerate(messages):
+        parsed = parse_message(raw_msg, session_id, seq)
+        if (
+            parsed.role == "user"
+            and parsed.content_type not in _NON_PROMPT_CTYPES
+            and current
+        ):
+            yield _create_interaction(current, session_id, index)
+            index += 1
+            current = []
+        current.append(parsed)
+    if current:
+        yield _create_interaction(current, session_id, index)
+
+
+def _create_interaction(
+    messages: list[ParsedMessage], session_id: str, index: int
+) -> Interaction:
+    """Build an :class:`Interaction` from a run of parsed messages."""
+    user_prompt = ""
+    for msg in messages:
+        if msg.role == "user" and msg.content_type not in _NON_PROMPT_CTYPES:
+            user_prompt = msg.text_content
+            break
+
+    # dict.fromkeys dedups in C while keeping first-seen order.
+    tool_calls = list(
+        dict.fromkeys(
+            tool.tool_name
+            for msg in messages
+            for tool in msg.tool_usages
+            if tool.tool_name
+        )
+    )
+
+    total_cost = math.fsum(msg.cost_usd for msg in messages if msg.cost_usd)
+
+    return Interaction(
+        interaction_id=f"{session_id}-i{index}",
+        session_id=session_id,
+        user_prompt=user_prompt,
+        messages=messages,
+        tool_calls=tool_calls,
+        total_cost_usd=total_cost,
+        started_at=messages[0].timestamp,
+        ended_at=messages[-1].timestamp,
+    )
@@ -0,0 +1,5 @@
+"""Web UI backend for claude-code-search."""
+
+from .app import create_app, run_server
+
+__all__ = ["create_app", "run_server"]
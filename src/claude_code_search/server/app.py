@@ -0,0 +1,429 @@
+"""FastAPI application serving the search API and the single-page UI."""
+
+import hashlib
+import os
+import webbrowser
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+from typing import Any
+
+import orjson
+import uvicorn
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from fastapi.staticfiles import StaticFiles
+
+from ..formatters import iter_csv_rows
+from ..index import SearchIndex
+from .models import SESSION_LIST_ADAPTER
+
+# What /api/search returns unless the caller asks for more: enough for the
+# result cards and grouping without shipping multi-KB tool/thinking columns.
+DEFAULT_SEARCH_FIELDS = (
+    "message_id",
+    "session_id",
+    "role",
+    "timestamp",
+    "text_content",
+)
+
+STATIC_DIR = Path(__file__).parent.parent / "static"
+
+# TTL cache over search results, keyed on the normalized query tuple.
+# Iterative typing, paging and retries re-issue identical queries, so a
+# small in-process cache turns the repeated FTS scans into dict hits.
+_SEARCH_CACHE: dict[tuple[Any, ...], tuple[float, Any]] = {}
+_SEARCH_CACHE_MAX = 512
+_SEARCH_CACHE_TTL = 60.0
+_CACHE_LOCK = Lock()
+
+
+def _search_cache_get(key: tuple[Any, ...]) -> Any | None:
+    with _CACHE_LOCK:
+        entry = _SEARCH_CACHE.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if monotonic() - stored_at > _SEARCH_CACHE_TTL:
+            del _SEARCH_CACHE[key]
+            return None
+        return value
+
+
+def _search_cache_put(key: tuple[Any, ...], value: Any) -> None:
+    with _CACHE_LOCK:
+        if len(_SEARCH_CACHE) >= _SEARCH_CACHE_MAX:
+            del _SEARCH_CACHE[next(iter(_SEARCH_CACHE))]
+        _SEARCH_CACHE[key] = (monotonic(), value)
+
+
+def invalidate_search_cache() -> None:
+    """Drop cached search results; call whenever the index mutates."""
+    global _stats_cache
+    with _CACHE_LOCK:
+        _SEARCH_CACHE.clear()
+        _stats_cache = None
+
+
+# Stats change only when sessions are (re)indexed, but the UI header asks
+# for them on every navigation; (index, computed_at, stats, etag).
+_STATS_TTL = 5.0
+_stats_cache: tuple[SearchIndex, float, dict[str, Any], str] | None = None
+
+
+def get_index() -> SearchIndex:
+    """Dependency placeholder; create_app overrides it with the live index."""
+    raise RuntimeError("SearchIndex dependency not configured")
+
+
+# The SPA shell is requested on every page load; read it once at import
+# instead of re-statting and streaming the file per GET.
+_INDEX_HTML = (STATIC_DIR / "index.html").read_bytes()
+_INDEX_ETAG = hashlib.md5(_INDEX_HTML).hexdigest()
+
+# Module-level router: FastAPI analyzes the endpoint signatures once, and
+# every create_app call reuses that analysis instead of re-introspecting
+# fresh closures.
+router = APIRouter()
+
+
+@router.get("/")
+async def root(request: Request):
+    if request.headers.get("if-none-match") == _INDEX_ETAG:
+        return Response(status_code=304)
+    return Response(
+        content=_INDEX_HTML,
+        media_type="text/html",
+        headers={"ETag": _INDEX_ETAG, "Cache-Control": "public, max-age=300"},
+    )
+
+
+@router.get("/api/stats")
+def get_stats(request: Request, index: SearchIndex = Depends(get_index)):
+    global _stats_cache
+    now = monotonic()
+    # Snapshot the global once: invalidate_search_cache() may set it to
+    # None from another thread mid-request, and a concurrent refresh must
+    # not mix stats and etag from different generations.
+    cache = _stats_cache
+    if cache is not None and cache[0] is index and now - cache[1] < _STATS_TTL:
+        stats, etag = cache[2], cache[3]
+    else:
+        stats = index.get_stats()
+        etag = hashlib.blake2b(
+            f"{stats['message_count']}:{stats['latest_message']}".encode(),
+            digest_size=8,
+        ).hexdigest()
+        _stats_cache = (index, now, stats, etag)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+    return ORJSONResponse(stats, headers={"ETag": etag})
+
+
+@router.get("/api/sessions", response_model=None)
+def list_sessions(index: SearchIndex = Depends(get_index)):
+    sessions = SESSION_LIST_ADAPTER.validate_python(index.list_sessions())
+    return ORJSONResponse(SESSION_LIST_ADAPTER.dump_python(sessions, mode="json"))
+
+
+@router.get("/api/sessions/{session_id}")
+def get_session(session_id: str, index: SearchIndex = Depends(get_index)):
+    session = index.get_session(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
+
+
+@router.get("/api/search")
+def search(
+    q: str = Query(..., min_length=1),
+    role: str | None = Query(None),
+    tool: str | None = Query(None),
+    session: str | None = Query(None),
+    since: str | None = Query(None),
+    until: str | None = Query(None),
+    content_type: str | None = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    fields: str | None = Query(None),
+    index: SearchIndex = Depends(get_index),
+):
+    if fields:
+        field_tuple = tuple(
+            dict.fromkeys(name.strip() for name in fields.split(",") if name.strip())
+        )
+    else:
+        field_tuple = DEFAULT_SEARCH_FIELDS
+    # The index object itself scopes entries to one live index, mirroring
+    # the identity check on the stats cache; two apps over different
+    # indexes in one process must not serve each other's results. Keying
+    # on id() instead would let a new index allocated at a dead one's
+    # address inherit its entries.
+    key = (
+        "search",
+        index,
+        q,
+        role,
+        tool,
+        session,
+        since,
+        until,
+        content_type,
+        limit,
+        field_tuple,
+    )
+    results = _search_cache_get(key)
+    if results is None:
+        try:
+            results = index.search(
+                query=q,
+                role=role,
+                tool=tool,
+                session_id=session,
+                since=since,
+                until=until,
+                content_type=content_type,
+                limit=limit,
+                fields=field_tuple,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+        _search_cache_put(key, results)
+    interactions, session_groups = _group_results(index, results)
+    return _envelope_response(
+        q, results, interactions=interactions, sessions=session_groups
+    )
+
+
+@router.get("/api/search/tools")
+def search_tools(
+    q: str = Query(..., min_length=1),
+    tool_name: str | None = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    index: SearchIndex = Depends(get_index),
+):
+    key = ("search_tools", index, q, tool_name, limit)
+    results = _search_cache_get(key)
+    if results is None:
+        results = index.search_tools(q, tool_name=tool_name, limit=limit)
+        _search_cache_put(key, results)
+    return _envelope_response(q, results)
+
+
+@router.get("/api/messages/{message_id}")
+def get_message(message_id: str, index: SearchIndex = Depends(get_index)):
+    message = index.get_message(message_id)
+    if message is None:
+        raise HTTPException(status_code=404, detail="Message not found")
+    return message
+
+
+@router.get("/api/messages/{message_id}/context")
+def get_message_context(
+    message_id: str,
+    before: int = Query(2, ge=0, le=10),
+    after: int = Query(2, ge=0, le=10),
+    index: SearchIndex = Depends(get_index),
+):
+    payload = index.get_message_with_context(message_id, before, after)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Message not found")
+    return payload
+
+
+@router.get("/api/export")
+def export_results(
+    q: str = Query(..., min_length=1),
+    format: str = Query("json", pattern="^(json|csv)$"),
+    role: str | None = Query(None),
+    session: str | None = Query(None),
+    index: SearchIndex = Depends(get_index),
+):
+    results = index.search(query=q, role=role, session_id=session, limit=1000)
+    if format == "csv":
+        return StreamingResponse(
+            iter_csv_rows(results),
+            media_type="text/csv",
+            headers={"Content-Disposition": "attachment; filename=results.csv"},
+        )
+    return Response(
+        orjson.dumps(results, default=str),
+        media_type="application/json",
+        headers={"Content-Disposition": "attachment; filename=results.json"},
+    )
+
+
+def create_app(search_index: SearchIndex) -> FastAPI:
+    """Build the FastAPI app around the given index."""
+    invalidate_search_cache()
+
+    app = FastAPI(title="Claude Code Search", default_response_class=ORJSONResponse)
+    app.include_router(router)
+    app.dependency_overrides[get_index] = lambda: search_index
+
+    # Catch-all for any further frontend assets (JS/CSS split out of the
+    # shell): Starlette's optimized file path with ETag/304 handling. The
+    # explicit "/" route above keeps serving the shell from memory.
+    # check_dir=False skips the existence stat at construction.
+    app.mount(
+        "/",
+        StaticFiles(directory=STATIC_DIR, html=True, check_dir=False),
+        name="static",
+    )
+
+    return app
+
+
+def _envelope_response(
+    query: str,
+    results: list[dict[str, Any]],
+    interactions: list[dict[str, Any]] | None = None,
+    sessions: list[dict[str, Any]] | None = None,
+) -> Response:
+    """Encode a search envelope straight to bytes, bypassing FastAPI serialization."""
+    payload = {"results": results, "total": len(results), "query": query}
+    if interactions is not None:
+        payload["interactions"] = interactions
+        payload["sessions"] = sessions
+    return Response(
+        content=orjson.dumps(payload, default=str), media_type="application/json"
+    )
+
+
+_PREVIEW_FIELDS = ("text_content", "thinking_content", "tool_summary", "tool_result")
+
+
+def _build_match_preview(result: dict[str, Any]) -> str:
+    """Short single-line preview of what matched in a search result."""
+    # Columns come back from DuckDB as str already; no coercion needed.
+    preview = next((result[k] for k in _PREVIEW_FIELDS if result.get(k)), "")
+    preview = preview.replace("\n", " ")
+    if len(preview) > 180:
+        return preview[:180] + "..."
+    return preview
+
+
+def _group_results(
+    search_index: SearchIndex, results: list[dict[str, Any]]
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Roll search hits up into interactions and per-session summaries.
+
+    One pass over the results feeds both groupings; interaction summaries
+    and session rows are each fetched with a single IN (...) query.
+    """
+    mapping = search_index.map_messages_to_interactions(
+        [r["message_id"] for r in results]
+    )
+    summaries = search_index.get_interaction_summaries(sorted(set(mapping.values())))
+
+    grouped: dict[str, dict[str, Any]] = {}
+    for result in results:
+        interaction_id = mapping.get(result["message_id"])
+        if interaction_id is None:
+            continue
+        entry = grouped.get(interaction_id)
+        if entry is None:
+            entry = dict(summaries[interaction_id])
+            entry["match_count"] = 0
+            entry["match_previews"] = []
+            grouped[interaction_id] = entry
+        entry["match_count"] = entry["match_count"] + 1
+        if len(entry["match_previews"]) < 3:
+            entry["match_previews"].append(_build_match_preview(result))
+
+    sessions = search_index.get_sessions_bulk(
+        sorted({entry["session_id"] for entry in grouped.values()})
+    )
+    session_groups: dict[str, dict[str, Any]] = {}
+    for entry in grouped.values():
+        session_id = entry["session_id"]
+        group = session_groups.get(session_id)
+        if group is None:
+            session = sessions.get(session_id, {})
+            group = {
+                "session_id": session_id,
+                "project_directory": session.get("project_directory"),
+                "last_message_at": session.get("last_message_at"),
+                "interaction_count": 0,
+                "match_count": 0,
+            }
+            session_groups[session_id] = group
+        group["interaction_count"] = group["interaction_count"] + 1
+        group["match_count"] = group["match_count"] + entry["match_count"]
+
+    interactions = sorted(
+        grouped.values(), key=lambda i: i["match_count"], reverse=True
+    )
+    by_session = sorted(
+        session_groups.values(), key=lambda s: s["match_count"], reverse=True
+    )
+    return interactions, by_session
+
+
+# Environment key the multi-worker app factory reads the database path from;
+# worker processes cannot inherit a live DuckDB connection.
+DB_PATH_ENV = "CLAUDE_CODE_SEARCH_DB"
+
+
+def create_app_from_env() -> FastAPI:
+    """App factory for multi-worker serving.
+
+    Each uvicorn worker builds its own read-only index over the shared
+    database file, which DuckDB supports for concurrent readers.
+    """
+    return create_app(SearchIndex(os.environ[DB_PATH_ENV], read_only=True))
+
+
+def run_server(
+    search_index: SearchIndex,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    open_browser: bool = True,
+    workers: int | None = None,
+    db_path: str | None = None,
+) -> None:
+    """Start the web server with the given index.
+
+    With ``workers > 1`` and a persistent ``db_path``, serving scales across
+    cores: each worker process opens the database read-only. An in-memory
+    index cannot be shared across processes, so it always serves
+    single-process.
+    """
+    if open_browser:
+        webbrowser.open(f"http://{host}:{port}")
+
+    # uvloop + httptools replace the pure-Python event loop and h11 parser;
+    # uvloop is unavailable on Windows, so fall back to the defaults there.
+    try:
+        import uvloop  # noqa: F401
+
+        loop, http = "uvloop", "httptools"
+    except ImportError:
+        loop, http = "asyncio", "h11"
+
+    # No access log and no per-response Server/Date headers: both cost a
+    # formatted record or strftime on every request of the chatty search UI.
+    options = dict(
+        host=host,
+        port=port,
+        log_level="warning",
+        loop=loop,
+        http=http,
+        access_log=False,
+        server_header=False,
+        date_header=False,
+    )
+
+    if workers and workers > 1 and db_path is not None:
+        # Release the write lock so the read-only workers can open the file.
+        search_index.close()
+        os.environ[DB_PATH_ENV] = db_path
+        uvicorn.run(
+            "claude_code_search.server.app:create_app_from_env",
+            factory=True,
+            workers=workers,
+            **options,
+        )
+        return
+
+    uvicorn.run(create_app(search_index), **options)
@@ -0,0 +1,22 @@
+"""Pydantic models for API responses."""
+
+from datetime import datetime
+
+from pydantic import BaseModel, TypeAdapter
+
+
+class SessionSummary(BaseModel):
+    session_id: str
+    source: str
+    session_path: str | None = None
+    project_directory: str | None = None
+    created_at: datetime | None = None
+    last_message_at: datetime | None = None
+    message_count: int = 0
+    total_cost_usd: float = 0.0
+    indexed_at: datetime | None = None
+
+
+# Built once at import so list responses go through pydantic-core's Rust
+# validator/serializer instead of FastAPI resolving a response model per call.
+SESSION_LIST_ADAPTER = TypeAdapter(list[SessionSummary])
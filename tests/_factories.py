@@ -0,0 +1,57 @@
+"""Factories for building synthetic session messages in bulk.
+
+Role strings are interned and the dict shapes are shared, so tests can be
+parametrized over hundreds of interactions without allocation noise
+drowning out the code under test.
+"""
+
+import sys
+from typing import Any
+
+_USER = sys.intern("user")
+_ASSISTANT = sys.intern("assistant")
+
+
+def build_exchange(i: int, tool: str | None = None) -> list[dict[str, Any]]:
+    """One user prompt plus its assistant reply, optionally with a tool call."""
+    messages = [
+        {
+            "uuid": f"gen-m{i}-u",
+            "type": _USER,
+            "message": {"role": _USER, "content": f"Prompt number {i}"},
+            "timestamp": f"2024-12-25T{10 + i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}Z",
+        },
+        {
+            "uuid": f"gen-m{i}-a",
+            "type": _ASSISTANT,
+            "message": {"role": _ASSISTANT, "content": f"Reply to prompt number {i}"},
+        },
+    ]
+    if tool:
+        messages.insert(
+            1,
+            {
+                "uuid": f"gen-m{i}-t",
+                "type": _ASSISTANT,
+                "message": {
+                    "role": _ASSISTANT,
+                    "content": [
+                        {
+                            "type": "tool_use",
+                            "id": f"gen-t{i}",
+                            "name": tool,
+                            "input": {"command": f"echo {i}"},
+                        }
+                    ],
+                },
+            },
+        )
+    return messages
+
+
+def build_messages(n: int, tool: str | None = None) -> list[dict[str, Any]]:
+    """A session of ``n`` exchanges, flattened into one message list."""
+    messages: list[dict[str, Any]] = []
+    for i in range(n):
+        messages.extend(build_exchange(i, tool))
+    return messages
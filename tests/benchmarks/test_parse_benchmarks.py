@@ -0,0 +1,21 @@
+"""Throughput benchmarks for the message parser.
+
+Run with ``pytest tests/benchmarks --benchmark-only``; skipped entirely
+when pytest-benchmark is not installed. Thresholds are left to the
+benchmark comparison workflow (``--benchmark-compare``) rather than
+hard-coded asserts, which flake across runner hardware.
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+# Deliberately after the importorskip gate above.
+from tests._factories import build_messages  # noqa: E402
+from claude_code_search.parsers import parse_messages  # noqa: E402
+
+
+def test_parse_messages_throughput(benchmark):
+    messages = build_messages(500)
+    results = benchmark(parse_messages, messages, "bench-session")
+    assert len(results) == len(messages)
@@ -0,0 +1,62 @@
+"""Shared fixtures for the test suite."""
+
+from pathlib import Path
+
+import orjson
+import pytest
+
+from claude_code_search.index import SearchIndex
+from claude_code_search.parsers import parse_message
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Tests assert on content (or explicit ORDER BY clauses), never on raw row
+# order, so DuckDB may pipeline inserts freely.
+DB_CONFIG = {"preserve_insertion_order": "false"}
+
+_SAMPLE_SESSION_PATH = FIXTURES_DIR / "sample_session.jsonl"
+
+# Parsed once at import: one orjson parse of the whole file instead of a
+# json.loads per line, frozen as a tuple since tests treat it as read-only.
+_SAMPLE_MESSAGES = tuple(
+    orjson.loads(
+        b"["
+        + b",".join(
+            line
+            for line in _SAMPLE_SESSION_PATH.read_bytes().splitlines()
+            if line.strip()
+        )
+        + b"]"
+    )
+)
+
+
+@pytest.fixture(scope="session")
+def sample_session_path():
+    return _SAMPLE_SESSION_PATH
+
+
+@pytest.fixture(scope="session")
+def sample_messages():
+    return _SAMPLE_MESSAGES
+
+
+@pytest.fixture(scope="session")
+def sample_session_messages(sample_messages):
+    return [
+        parse_message(raw, "sess-fixture", seq)
+        for seq, raw in enumerate(sample_messages)
+    ]
+
+
+@pytest.fixture(scope="session")
+def indexed_search(sample_messages):
+    """Sample session indexed once for the whole run; for read-only tests.
+
+    Schema creation, parsing and the FTS build happen a single time here;
+    tests that mutate the index build their own throwaway instance instead.
+    """
+    idx = SearchIndex(":memory:", config=DB_CONFIG)
+    idx.index_session("sess-fixture", sample_messages, source="local")
+    yield idx
+    idx.close()
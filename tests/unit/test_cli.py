@@ -0,0 +1,70 @@
+"""Tests for the command-line interface."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+from click.testing import CliRunner
+
+from claude_code_search.cli import cli
+from claude_code_search.index import SearchIndex
+
+
+def _invoke(*args):
+    """Run the CLI in-process; no interpreter startup or reimports per test."""
+    return CliRunner().invoke(cli, args)
+
+
+@pytest.fixture(scope="module")
+def cli_db(tmp_path_factory, sample_messages):
+    """The sample session indexed into a database file, built once per module."""
+    db_path = tmp_path_factory.mktemp("cli") / "cli.db"
+    index = SearchIndex(str(db_path))
+    index.index_session("sess-fixture", sample_messages, source="local")
+    index.close()
+    return db_path
+
+
+class TestCliBasics:
+    def test_entrypoint_smoke(self):
+        # The one end-to-end subprocess test: proves the installed module
+        # actually launches. Everything else runs in-process.
+        result = subprocess.run(
+            [sys.executable, "-m", "claude_code_search", "--help"],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0
+
+    def test_help_lists_commands(self):
+        result = _invoke("--help")
+        assert result.exit_code == 0
+        for command in ("serve", "index", "search", "list", "stats"):
+            assert command in result.output
+
+    def test_version(self):
+        result = _invoke("--version")
+        assert result.exit_code == 0
+        assert "claude-code-search" in result.output
+
+
+class TestSearchCommand:
+    def test_search_json_output(self, cli_db):
+        result = _invoke(
+            "search", "authentication", "--db", str(cli_db), "--format", "json"
+        )
+        assert result.exit_code == 0
+        payload = json.loads(result.output)
+        assert payload[0]["message_id"] == "fix-m0"
+
+    def test_search_missing_db_fails(self, tmp_path):
+        result = _invoke("search", "anything", "--db", str(tmp_path / "missing.db"))
+        assert result.exit_code != 0
+
+
+class TestStatsCommand:
+    def test_stats_output(self, cli_db):
+        result = _invoke("stats", "--db", str(cli_db))
+        assert result.exit_code == 0
+        assert "Sessions indexed: 1" in result.output
@@ -0,0 +1,244 @@
+"""Tests for the DuckDB search index."""
+
+from functools import lru_cache
+
+import pytest
+
+from tests._factories import build_messages
+from tests.conftest import DB_CONFIG
+from claude_code_search.index import SearchIndex
+
+
+def _other_session():
+    """A second, tiny session with message ids distinct from the fixture."""
+    return [
+        {
+            "uuid": "oth-m0",
+            "type": "user",
+            "message": {"role": "user", "content": "Investigate pagination latency"},
+            "timestamp": "2024-12-26T09:00:00Z",
+        },
+        {
+            "uuid": "oth-m1",
+            "type": "assistant",
+            "message": {
+                "role": "assistant",
+                "content": "The pagination query lacked an index.",
+            },
+            "timestamp": "2024-12-26T09:00:20Z",
+        },
+    ]
+
+
+@pytest.fixture
+def index():
+    idx = SearchIndex(":memory:", config=DB_CONFIG)
+    yield idx
+    idx.close()
+
+
+class TestSchema:
+    def test_new_index_is_empty(self, index):
+        assert index.is_empty() is True
+
+    def test_indexing_marks_nonempty(self, indexed_search):
+        assert indexed_search.is_empty() is False
+
+    def test_read_only_reopen_can_search(self, tmp_path, sample_messages):
+        db_path = str(tmp_path / "ro.db")
+        writer = SearchIndex(db_path)
+        writer.index_session("sess-fixture", sample_messages, source="local")
+        writer.close()
+        reader = SearchIndex(db_path, read_only=True)
+        assert len(reader.search("authentication")) > 0
+        reader.close()
+
+
+class TestIndexSession:
+    def test_counts_messages(self, indexed_search, sample_messages):
+        stats = indexed_search.get_stats()
+        assert stats["message_count"] == len(sample_messages)
+
+    def test_indexes_tool_usages(self, indexed_search):
+        stats = indexed_search.get_stats()
+        assert stats["tool_count"] == 3
+
+    def test_reindexing_replaces_session(self, index, sample_messages):
+        index.index_session("sess-fixture", sample_messages, source="local")
+        index.index_session("sess-fixture", sample_messages, source="local")
+        stats = index.get_stats()
+        assert stats["session_count"] == 1
+        assert stats["message_count"] == len(sample_messages)
+
+    def test_indexes_multiple_sessions(self, index, sample_messages):
+        count = index.index_sessions(
+            [
+                ("sess-fixture", sample_messages, "local"),
+                ("sess-other", _other_session(), "local"),
+            ]
+        )
+        stats = index.get_stats()
+        assert count == len(sample_messages) + 2
+        assert stats["session_count"] == 2
+        assert stats["message_count"] == len(sample_messages) + 2
+
+    def test_deferred_fts_builds_once(self, index, sample_messages):
+        index.index_session(
+            "sess-fixture", sample_messages, source="local", defer_fts=True
+        )
+        index.index_session(
+            "sess-other", _other_session(), source="local", defer_fts=True
+        )
+        index.finalize_fts()
+        assert len(index.search("pagination")) > 0
+
+
+class TestSearch:
+    def test_search_returns_results(self, indexed_search):
+        results = indexed_search.search("authentication")
+        assert len(results) > 0
+        assert results[0]["message_id"] == "fix-m0"
+
+    def test_search_with_role_filter(self, indexed_search):
+        results = indexed_search.search(
+            "pagination", role="user", fields=("message_id",)
+        )
+        assert len(results) > 0
+        # Count violations in one vectorized aggregate instead of a
+        # Python-level loop over the result rows.
+        ids = [r["message_id"] for r in results]
+        qmarks = ", ".join("?" for _ in ids)
+        violations = indexed_search.conn.execute(
+            f"SELECT count(*) FILTER (WHERE role != 'user') FROM messages "
+            f"WHERE message_id IN ({qmarks})",
+            ids,
+        ).fetchone()[0]
+        assert violations == 0
+
+    def test_search_with_session_filter(self, index, sample_messages):
+        index.index_sessions(
+            [
+                ("sess-fixture", sample_messages, "local"),
+                ("sess-other", _other_session(), "local"),
+            ]
+        )
+        results = index.search("pagination", session_id="sess-other")
+        assert len(results) > 0
+        assert all(r["session_id"] == "sess-other" for r in results)
+
+    def test_search_respects_limit(self, indexed_search):
+        results = indexed_search.search("pagination", limit=1)
+        assert len(results) == 1
+
+    def test_search_empty_index(self, index):
+        assert index.search("anything") == []
+
+    def test_search_includes_score(self, indexed_search):
+        results = indexed_search.search("authentication")
+        assert results[0]["score"] is not None
+
+
+@pytest.fixture(scope="module")
+def large_indexed():
+    """A synthetic thousand-message session, indexed once per module."""
+    idx = SearchIndex(":memory:", config=DB_CONFIG)
+    idx.index_session("sess-large", build_messages(500), source="local")
+    yield idx
+    idx.close()
+
+
+class TestLargeCorpus:
+    def test_search_scales_to_large_corpus(self, large_indexed):
+        results = large_indexed.search("prompt number", limit=10)
+        assert len(results) == 10
+
+    def test_search_uses_fts_index(self, large_indexed):
+        plan_rows = large_indexed.conn.execute(
+            """
+            EXPLAIN WITH matches AS (
+                SELECT *, fts_main_messages.match_bm25(
+                    message_id, 'prompt', fields := 'searchable_text'
+                ) AS score
+                FROM messages
+            )
+            SELECT m.message_id FROM matches m WHERE m.score IS NOT NULL
+            ORDER BY m.score DESC LIMIT 10
+            """
+        ).fetchall()
+        plan = "\n".join(row[1] for row in plan_rows)
+        # The BM25 macro must expand into the fts term tables; a plan
+        # without them means search silently degraded to a plain scan.
+        assert "qterms" in plan
+        assert "tokens" in plan
+
+
+class TestSearchTools:
+    def test_search_tools_matches_command(self, indexed_search):
+        results = indexed_search.search_tools("rotate")
+        assert len(results) > 0
+        assert results[0]["tool_name"] == "Bash"
+
+    def test_search_tools_with_name_filter(self, indexed_search):
+        results = indexed_search.search_tools("middleware", tool_name="Read")
+        assert all(r["tool_name"] == "Read" for r in results)
+
+
+class TestMessages:
+    def test_get_message(self, indexed_search):
+        message = indexed_search.get_message("fix-m0")
+        assert message is not None
+        assert message["role"] == "user"
+
+    def test_get_missing_message_returns_none(self, indexed_search):
+        assert indexed_search.get_message("no-such-id") is None
+
+    def test_list_messages_ordered(self, indexed_search, sample_messages):
+        messages = indexed_search.list_messages("sess-fixture")
+        assert len(messages) == len(sample_messages)
+        sequences = [m["sequence_num"] for m in messages]
+        assert sequences == sorted(sequences)
+
+
+@lru_cache(maxsize=128)
+def _cached_context(idx, message_id, before, after):
+    """Memoize identical context queries against the shared read-only index."""
+    return idx.get_message_with_context(message_id, before=before, after=after)
+
+
+class TestMessageContext:
+    @pytest.mark.parametrize(
+        ("msg_id", "before", "after", "expected_ids"),
+        [
+            ("fix-m3", 1, 1, ["fix-m2", "fix-m3", "fix-m4"]),
+            ("fix-m0", 5, 1, ["fix-m0", "fix-m1"]),
+            ("fix-m9", 1, 5, ["fix-m8", "fix-m9"]),
+        ],
+        ids=["window", "clamped_at_start", "clamped_at_end"],
+    )
+    def test_context_boundaries(
+        self, indexed_search, msg_id, before, after, expected_ids
+    ):
+        payload = _cached_context(indexed_search, msg_id, before, after)
+        assert [m["message_id"] for m in payload["context"]] == expected_ids
+
+    def test_context_missing_message(self, indexed_search):
+        assert _cached_context(indexed_search, "no-such-id", 2, 2) is None
+
+
+class TestSessions:
+    def test_list_sessions(self, indexed_search):
+        sessions = indexed_search.list_sessions()
+        assert len(sessions) == 1
+        assert sessions[0]["session_id"] == "sess-fixture"
+
+    def test_get_session(self, indexed_search, sample_messages):
+        session = indexed_search.get_session("sess-fixture")
+        assert session is not None
+        assert session["message_count"] == len(sample_messages)
+
+    def test_get_missing_session_returns_none(self, indexed_search):
+        assert indexed_search.get_session("no-such-id") is None
+
+    def test_session_cost_summed(self, indexed_search):
+        session = indexed_search.get_session("sess-fixture")
+        assert float(session["total_cost_usd"]) == pytest.approx(0.03)
@@ -0,0 +1,200 @@
+"""Tests for local session discovery and loading."""
+
+import orjson
+import pytest
+
+from claude_code_search.loaders.local import (
+    _extract_preview,
+    _is_session_jsonl,
+    discover_local_sessions,
+    load_local_session,
+)
+
+
+def make_messages():
+    return [
+        {
+            "uuid": "msg-001",
+            "type": "user",
+            "message": {
+                "role": "user",
+                "content": "Create a Python CLI for searching files",
+            },
+            "timestamp": "2024-12-25T10:00:00Z",
+        },
+        {
+            "uuid": "msg-002",
+            "type": "assistant",
+            "message": {
+                "role": "assistant",
+                "content": [
+                    {"type": "text", "text": "I'll create a CLI using Click..."}
+                ],
+            },
+            "timestamp": "2024-12-25T10:00:05Z",
+            "costUSD": 0.02,
+        },
+    ]
+
+
+# Serialized once at import: every session file these tests materialize
+# carries the same two-message payload, so each copy is one write_bytes
+# instead of a fresh per-message orjson.dumps pass.
+_SESSION_BYTES = b"".join(orjson.dumps(msg) + b"\n" for msg in make_messages())
+
+
+@pytest.fixture
+def temp_session_dir(tmp_path):
+    """A ``~/.claude``-style tree with one session in each location."""
+    sessions_dir = tmp_path / "sessions"
+    session_dir = sessions_dir / "abc12345"
+    session_dir.mkdir(parents=True)
+    (session_dir / "messages.jsonl").write_bytes(_SESSION_BYTES)
+
+    projects_dir = tmp_path / "projects"
+    project_dir = projects_dir / "-root-myproject"
+    project_dir.mkdir(parents=True)
+    (project_dir / "def67890.jsonl").write_bytes(_SESSION_BYTES)
+
+    return sessions_dir, projects_dir
+
+
+class TestDiscoverLocalSessions:
+    def test_finds_sessions_in_both_locations(self, temp_session_dir):
+        sessions_dir, projects_dir = temp_session_dir
+        sessions = discover_local_sessions(sessions_dir, projects_dir)
+        assert {s["id"] for s in sessions} == {"abc12345", "def67890"}
+
+    def test_project_sessions_record_project_directory(self, temp_session_dir):
+        sessions_dir, projects_dir = temp_session_dir
+        sessions = discover_local_sessions(sessions_dir, projects_dir)
+        by_id = {s["id"]: s for s in sessions}
+        assert by_id["def67890"]["project_directory"] == "-root-myproject"
+
+    def test_missing_dirs_yield_no_sessions(self, tmp_path):
+        sessions = discover_local_sessions(tmp_path / "nope", tmp_path / "nada")
+        assert sessions == []
+
+    def test_ignores_non_session_jsonl(self, temp_session_dir, tmp_path):
+        sessions_dir, projects_dir = temp_session_dir
+        stray = projects_dir / "-root-myproject" / "notes.jsonl"
+        stray.write_bytes(orjson.dumps({"note": "not a session"}) + b"\n")
+        sessions = discover_local_sessions(sessions_dir, projects_dir)
+        assert "notes" not in {s["id"] for s in sessions}
+
+
+class TestDiscoveryCache:
+    def test_cache_hit_serves_cached_entries(self, temp_session_dir, tmp_path):
+        sessions_dir, projects_dir = temp_session_dir
+        cache_path = tmp_path / "cache" / "discovery.json"
+        first = discover_local_sessions(
+            sessions_dir, projects_dir, cache_path=cache_path
+        )
+        assert cache_path.exists()
+        # Appending to an existing file leaves the root mtimes untouched,
+        # so the second call is served from the cache.
+        with (sessions_dir / "abc12345" / "messages.jsonl").open("ab") as f:
+            f.write(
+                orjson.dumps(
+                    {"uuid": "msg-003", "message": {"role": "user", "content": "x"}}
+                )
+                + b"\n"
+            )
+        second = discover_local_sessions(
+            sessions_dir, projects_dir, cache_path=cache_path
+        )
+        assert second == first
+
+    def test_new_session_in_existing_project_invalidates_cache(
+        self, temp_session_dir, tmp_path
+    ):
+        sessions_dir, projects_dir = temp_session_dir
+        cache_path = tmp_path / "cache" / "discovery.json"
+        discover_local_sessions(sessions_dir, projects_dir, cache_path=cache_path)
+        # Only the project subdirectory's mtime changes here, not the root's.
+        (projects_dir / "-root-myproject" / "jkl22222.jsonl").write_bytes(
+            _SESSION_BYTES
+        )
+        sessions = discover_local_sessions(
+            sessions_dir, projects_dir, cache_path=cache_path
+        )
+        assert "jkl22222" in {s["id"] for s in sessions}
+
+    def test_new_session_invalidates_cache(self, temp_session_dir, tmp_path):
+        sessions_dir, projects_dir = temp_session_dir
+        cache_path = tmp_path / "cache" / "discovery.json"
+        discover_local_sessions(sessions_dir, projects_dir, cache_path=cache_path)
+        new_dir = sessions_dir / "ghi11111"
+        new_dir.mkdir()
+        (new_dir / "messages.jsonl").write_bytes(_SESSION_BYTES)
+        sessions = discover_local_sessions(
+            sessions_dir, projects_dir, cache_path=cache_path
+        )
+        assert "ghi11111" in {s["id"] for s in sessions}
+
+    def test_corrupt_cache_falls_back_to_rescan(self, temp_session_dir, tmp_path):
+        sessions_dir, projects_dir = temp_session_dir
+        cache_path = tmp_path / "discovery.json"
+        cache_path.write_text("not json{")
+        sessions = discover_local_sessions(
+            sessions_dir, projects_dir, cache_path=cache_path
+        )
+        assert {s["id"] for s in sessions} == {"abc12345", "def67890"}
+
+
+class TestIsSessionJsonl:
+    def test_accepts_session_file(self, temp_session_dir):
+        _, projects_dir = temp_session_dir
+        assert _is_session_jsonl(projects_dir / "-root-myproject" / "def67890.jsonl")
+
+    def test_rejects_other_jsonl(self, tmp_path):
+        other = tmp_path / "other.jsonl"
+        other.write_bytes(orjson.dumps({"note": "hello"}) + b"\n")
+        assert not _is_session_jsonl(other)
+
+    def test_rejects_missing_file(self, tmp_path):
+        assert not _is_session_jsonl(tmp_path / "absent.jsonl")
+
+
+class TestExtractPreview:
+    def test_preview_and_count(self, temp_session_dir):
+        sessions_dir, _ = temp_session_dir
+        preview, count = _extract_preview(sessions_dir / "abc12345" / "messages.jsonl")
+        assert preview.startswith("Create a Python CLI")
+        assert count == 2
+
+    def test_empty_file(self, tmp_path):
+        empty = tmp_path / "empty.jsonl"
+        empty.write_text("")
+        assert _extract_preview(empty) == ("", 0)
+
+
+class TestLoadLocalSession:
+    def test_loads_all_messages(self, temp_session_dir):
+        sessions_dir, _ = temp_session_dir
+        messages = load_local_session(sessions_dir / "abc12345" / "messages.jsonl")
+        assert len(messages) == 2
+        assert messages[0]["uuid"] == "msg-001"
+
+    def test_skips_malformed_lines(self, tmp_path):
+        path = tmp_path / "broken.jsonl"
+        path.write_bytes(
+            b'{"uuid": "msg-001", "message": {"role": "user", "content": "hi"}}\n'
+            b'{"uuid": "msg-002", "message": {"role":\n'
+        )
+        messages = load_local_session(path)
+        assert len(messages) == 1
+
+    def test_tolerates_sparse_malformed_lines_at_scale(self, tmp_path):
+        path = tmp_path / "large.jsonl"
+        lines = [
+            b"{not json"
+            if i % 100 == 0
+            else orjson.dumps(
+                {"uuid": f"msg-{i}", "message": {"role": "user", "content": "hi"}}
+            )
+            for i in range(10_000)
+        ]
+        path.write_bytes(b"\n".join(lines) + b"\n")
+        messages = load_local_session(path)
+        assert len(messages) == 9_900
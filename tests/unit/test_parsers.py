@@ -0,0 +1,500 @@
+"""Tests for message parsing."""
+
+import json
+
+import orjson
+import pytest
+
+from tests._factories import build_messages
+from claude_code_search.parsers import (
+    ParsedMessage,
+    group_messages_into_interactions,
+    parse_message,
+    parse_message_json,
+    parse_messages,
+    parse_messages_parallel,
+)
+
+# Parse each distinct raw message once per module; the tests only read the
+# results, so sharing the parsed instances is safe.
+_PARSED_CACHE = {}
+
+
+def parse_once(raw, session_id, seq):
+    key = (session_id, seq, raw["uuid"])
+    if key not in _PARSED_CACHE:
+        _PARSED_CACHE[key] = parse_message(raw, session_id, seq)
+    return _PARSED_CACHE[key]
+
+
+_HEREDOC_COMMIT_COMMAND = (
+    "git commit -m \"$(cat <<'EOF'\n"
+    "Fix the auth bug\n\n"
+    "Details about the fix.\n"
+    'EOF\n)"'
+)
+
+# Raw message fixtures, built once at import; parse_message treats its
+# input as read-only, so sharing them across tests is safe.
+_RAW_TEXT = {
+    "uuid": "msg-001",
+    "type": "user",
+    "message": {"role": "user", "content": "Create a Python CLI"},
+    "timestamp": "2024-12-25T10:00:00Z",
+}
+_RAW_TOOL_USE = {
+    "uuid": "msg-002",
+    "type": "assistant",
+    "message": {
+        "role": "assistant",
+        "content": [
+            {
+                "type": "tool_use",
+                "id": "tool-001",
+                "name": "Bash",
+                "input": {"command": "pytest tests/"},
+            }
+        ],
+    },
+}
+_RAW_FILE_TOOL = {
+    "uuid": "msg-003",
+    "type": "assistant",
+    "message": {
+        "role": "assistant",
+        "content": [
+            {
+                "type": "tool_use",
+                "id": "tool-002",
+                "name": "Edit",
+                "input": {"file_path": "src/cli.py", "old_string": "a"},
+            }
+        ],
+    },
+}
+_RAW_TOOL_WITH_RESULT = {
+    "uuid": "msg-004",
+    "type": "assistant",
+    "message": {
+        "role": "assistant",
+        "content": [
+            {
+                "type": "tool_use",
+                "id": "tool-003",
+                "name": "Bash",
+                "input": {"command": "ls"},
+            },
+            {
+                "type": "tool_result",
+                "tool_use_id": "tool-003",
+                "content": "cli.py\nindex.py",
+            },
+        ],
+    },
+}
+_RAW_TOOL_SUMMARY = {
+    "uuid": "msg-005",
+    "type": "assistant",
+    "message": {
+        "role": "assistant",
+        "content": [
+            {
+                "type": "tool_use",
+                "id": "tool-004",
+                "name": "Bash",
+                "input": {"command": "git status"},
+            }
+        ],
+    },
+}
+_RAW_COMMIT_COMMAND = {
+    "uuid": "msg-006",
+    "type": "assistant",
+    "message": {
+        "role": "assistant",
+        "content": [
+            {
+                "type": "tool_use",
+                "id": "tool-005",
+                "name": "Bash",
+                "input": {"command": 'git commit -m "Fix the auth bug"'},
+            }
+        ],
+    },
+}
+_RAW_COMMIT_HEREDOC = {
+    "uuid": "msg-006b",
+    "type": "assistant",
+    "message": {
+        "role": "assistant",
+        "content": [
+            {
+                "type": "tool_use",
+                "id": "tool-005b",
+                "name": "Bash",
+                "input": {"command": _HEREDOC_COMMIT_COMMAND},
+            }
+        ],
+    },
+}
+_RAW_COMMIT_RESULT = {
+    "uuid": "msg-007",
+    "type": "user",
+    "message": {
+        "role": "user",
+        "content": [
+            {
+                "type": "tool_result",
+                "tool_use_id": "tool-006",
+                "content": "[main abc1234] Fix the auth bug\n 1 file changed",
+            }
+        ],
+    },
+}
+_RAW_COST = {
+    "uuid": "msg-008",
+    "type": "assistant",
+    "message": {"role": "assistant", "content": "Done."},
+    "costUSD": 0.05,
+    "durationMs": 1500,
+}
+
+
+class TestParseMessage:
+    def test_parses_text_message(self):
+        # One structural comparison against the golden record also catches
+        # unintended changes in fields no per-attribute assert covered.
+        assert parse_once(_RAW_TEXT, "sess-1", 0) == ParsedMessage(
+            message_id="msg-001",
+            session_id="sess-1",
+            sequence_num=0,
+            role="user",
+            timestamp="2024-12-25T10:00:00Z",
+            text_content="Create a Python CLI",
+            thinking_content=None,
+            searchable_text="Create a Python CLI",
+            content_type="text",
+            tool_summary="",
+            cost_usd=None,
+            duration_ms=None,
+        )
+
+    def test_parses_tool_use(self):
+        result = parse_once(_RAW_TOOL_USE, "sess-1", 1)
+        assert [(t.tool_name, t.command, t.file_path) for t in result.tool_usages] == [
+            ("Bash", "pytest tests/", None)
+        ]
+
+    def test_extracts_file_path_for_file_tools(self):
+        result = parse_once(_RAW_FILE_TOOL, "sess-1", 2)
+        assert [(t.file_path, t.command) for t in result.tool_usages] == [
+            ("src/cli.py", None)
+        ]
+
+    def test_matches_tool_result_to_usage(self):
+        result = parse_once(_RAW_TOOL_WITH_RESULT, "sess-1", 3)
+        assert [(t.tool_result, t.is_error) for t in result.tool_usages] == [
+            ("cli.py\nindex.py", False)
+        ]
+
+    def test_tool_summary_mentions_tool(self):
+        result = parse_once(_RAW_TOOL_SUMMARY, "sess-1", 4)
+        assert result.tool_summary == "Bash: git status"
+
+    def test_extracts_commit_intent_from_command(self):
+        result = parse_once(_RAW_COMMIT_COMMAND, "sess-1", 5)
+        assert result.tool_usages[0].commit_intent == "Fix the auth bug"
+
+    def test_extracts_commit_intent_from_heredoc(self):
+        result = parse_once(_RAW_COMMIT_HEREDOC, "sess-1", 5)
+        assert result.tool_usages[0].commit_intent == "Fix the auth bug"
+
+    def test_extracts_commits_from_result(self):
+        result = parse_once(_RAW_COMMIT_RESULT, "sess-1", 6)
+        assert len(result.commits) == 1
+        commit = result.commits[0]
+        assert commit.branch == "main"
+        assert commit.commit_hash == b"abc1234"
+        assert commit.commit_hash_str == "abc1234"
+        assert commit.message == "Fix the auth bug"
+
+    def test_cost_and_duration(self):
+        result = parse_once(_RAW_COST, "sess-1", 7)
+        assert result.cost_usd == 0.05
+        assert result.duration_ms == 1500
+
+    def test_message_id_fallback(self):
+        raw = {"type": "user", "message": {"role": "user", "content": "hi"}}
+        result = parse_message(raw, "sess-1", 8)
+        assert result.message_id == "sess-1-8"
+
+
+class TestParseMessagesBatch:
+    def test_assigns_sequence_numbers(self):
+        results = parse_messages([_RAW_TEXT, _RAW_TOOL_USE], "sess-1")
+        assert [r.sequence_num for r in results] == [0, 1]
+
+    def test_matches_per_message_parse(self):
+        results = parse_messages([_RAW_TEXT, _RAW_COST], "sess-1")
+        assert results == [
+            parse_message(_RAW_TEXT, "sess-1", 0),
+            parse_message(_RAW_COST, "sess-1", 1),
+        ]
+
+    @pytest.mark.parametrize("n", [10, 1000, 10000])
+    def test_parse_many_messages(self, n):
+        messages = [dict(_RAW_TEXT, uuid=f"m-{i}") for i in range(n)]
+        results = parse_messages(messages, "sess-1")
+        assert len(results) == n
+        assert results[-1].message_id == f"m-{n - 1}"
+
+    def test_parse_message_json_equivalence(self):
+        raw_bytes = orjson.dumps(_RAW_TOOL_USE)
+        assert parse_message_json(raw_bytes, "sess-1", 1) == parse_message(
+            _RAW_TOOL_USE, "sess-1", 1
+        )
+
+
+class TestParseMessagesParallel:
+    def _lines(self, n):
+        return [
+            json.dumps(
+                {
+                    "uuid": f"msg-{i}",
+                    "type": "user",
+                    "message": {"role": "user", "content": f"prompt {i}"},
+                }
+            )
+            for i in range(n)
+        ]
+
+    def test_serial_path_preserves_order(self):
+        results = parse_messages_parallel(self._lines(10), "sess-1", workers=1)
+        assert [r.message_id for r in results] == [f"msg-{i}" for i in range(10)]
+
+    def test_matches_serial_parse(self):
+        lines = self._lines(5)
+        parallel = parse_messages_parallel(lines, "sess-1", workers=1)
+        serial = [
+            parse_message(json.loads(line), "sess-1", i) for i, line in enumerate(lines)
+        ]
+        assert parallel == serial
+
+
+_CONTENT_TYPE_CASES = [
+    (
+        "text",
+        {"type": "user", "message": {"role": "user", "content": "hello"}},
+    ),
+    (
+        "tool_use",
+        {
+            "type": "assistant",
+            "message": {
+                "role": "assistant",
+                "content": [
+                    {
+                        "type": "tool_use",
+                        "id": "t1",
+                        "name": "Read",
+                        "input": {"file_path": "x"},
+                    }
+                ],
+            },
+        },
+    ),
+    (
+        "tool_result",
+        {
+            "type": "user",
+            "message": {
+                "role": "user",
+                "content": [
+                    {"type": "tool_result", "tool_use_id": "t1", "content": "ok"}
+                ],
+            },
+        },
+    ),
+    (
+        "thinking",
+        {
+            "type": "assistant",
+            "message": {"role": "assistant", "content": []},
+            "thinking": "pondering the approach",
+        },
+    ),
+    (
+        "system",
+        {"type": "system", "message": {"role": "system", "content": ""}},
+    ),
+]
+
+
+class TestContentTypeDetection:
+    @pytest.mark.parametrize(
+        ("expected", "raw"),
+        _CONTENT_TYPE_CASES,
+        ids=[c[0] for c in _CONTENT_TYPE_CASES],
+    )
+    def test_content_type(self, expected, raw):
+        assert parse_message(raw, "sess-1", 0).content_type == expected
+
+
+class TestThinkingExtraction:
+    def test_thinking_block_extracted(self):
+        raw = {
+            "type": "assistant",
+            "message": {
+                "role": "assistant",
+                "content": [
+                    {"type": "thinking", "thinking": "Let me consider the options."},
+                    {"type": "text", "text": "Here's my answer."},
+                ],
+            },
+        }
+        result = parse_message(raw, "sess-1", 0)
+        assert result.thinking_content is not None
+        assert result.thinking_content == "Let me consider the options."
+
+    def test_top_level_thinking_extracted(self):
+        raw = {
+            "type": "assistant",
+            "message": {"role": "assistant", "content": "Answer."},
+            "thinking": "top-level thought",
+        }
+        result = parse_message(raw, "sess-1", 0)
+        assert result.thinking_content is not None
+        assert result.thinking_content == "top-level thought"
+
+    def test_combined_thinking_sources(self):
+        raw = {
+            "type": "assistant",
+            "message": {
+                "role": "assistant",
+                "content": [{"type": "thinking", "thinking": "block thought"}],
+            },
+            "thinking": "top-level thought",
+        }
+        result = parse_message(raw, "sess-1", 0)
+        # Contract: thinking blocks in content order, then top-level
+        # thinking, newline-joined.
+        assert result.thinking_content == "block thought\ntop-level thought"
+        assert result.content_type == "thinking"
+
+    def test_searchable_text_includes_thinking(self):
+        raw = {
+            "type": "assistant",
+            "message": {
+                "role": "assistant",
+                "content": [{"type": "text", "text": "visible answer"}],
+            },
+            "thinking": "hidden reasoning",
+        }
+        result = parse_message(raw, "sess-1", 0)
+        assert result.searchable_text == "visible answer\nhidden reasoning"
+        assert result.text_content == "visible answer"
+
+
+def _grouping_session():
+    return [
+        {
+            "uuid": "m1",
+            "type": "user",
+            "message": {"role": "user", "content": "First prompt"},
+            "timestamp": "2024-12-25T10:00:00Z",
+        },
+        {
+            "uuid": "m2",
+            "type": "assistant",
+            "message": {
+                "role": "assistant",
+                "content": [
+                    {
+                        "type": "tool_use",
+                        "id": "t1",
+                        "name": "Bash",
+                        "input": {"command": "ls"},
+                    }
+                ],
+            },
+            "costUSD": 0.01,
+        },
+        {
+            "uuid": "m3",
+            "type": "user",
+            "message": {
+                "role": "user",
+                "content": [
+                    {"type": "tool_result", "tool_use_id": "t1", "content": "ok"}
+                ],
+            },
+        },
+        {
+            "uuid": "m4",
+            "type": "user",
+            "message": {"role": "user", "content": "Second prompt"},
+            "timestamp": "2024-12-25T10:05:00Z",
+        },
+        {
+            "uuid": "m5",
+            "type": "assistant",
+            "message": {"role": "assistant", "content": "Done."},
+            "costUSD": 0.02,
+        },
+    ]
+
+
+def _check_splits_on_user_prompts(interactions):
+    assert len(interactions) == 2
+    assert interactions[0].user_prompt == "First prompt"
+    assert interactions[1].user_prompt == "Second prompt"
+
+
+def _check_tool_result_does_not_split(interactions):
+    assert len(interactions[0].messages) == 3
+
+
+def _check_collects_unique_tool_calls(interactions):
+    assert interactions[0].tool_calls == ["Bash"]
+    assert interactions[1].tool_calls == []
+
+
+def _check_total_cost_summed(interactions):
+    assert interactions[0].total_cost_usd == 0.01
+    assert interactions[1].total_cost_usd == 0.02
+
+
+def _check_interaction_ids_are_sequential(interactions):
+    assert interactions[0].interaction_id == "sess-1-i0"
+    assert interactions[1].interaction_id == "sess-1-i1"
+
+
+_GROUPING_CHECKS = {
+    "splits_on_user_prompts": _check_splits_on_user_prompts,
+    "tool_result_does_not_split": _check_tool_result_does_not_split,
+    "collects_unique_tool_calls": _check_collects_unique_tool_calls,
+    "total_cost_summed": _check_total_cost_summed,
+    "interaction_ids_are_sequential": _check_interaction_ids_are_sequential,
+}
+
+
+@pytest.fixture(scope="module")
+def grouped_interactions():
+    """The canonical session grouped once, shared by every invariant check."""
+    return list(group_messages_into_interactions(_grouping_session(), "sess-1"))
+
+
+class TestGroupMessagesIntoInteractions:
+    @pytest.mark.parametrize(
+        "check", _GROUPING_CHECKS.values(), ids=_GROUPING_CHECKS.keys()
+    )
+    def test_grouping_invariants(self, grouped_interactions, check):
+        check(grouped_interactions)
+
+    @pytest.mark.parametrize("n", [2, 100, 1000])
+    def test_scales_to_many_interactions(self, n):
+        interactions = list(
+            group_messages_into_interactions(build_messages(n), "sess-1")
+        )
+        assert len(interactions) == n
+        assert interactions[-1].user_prompt == f"Prompt number {n - 1}"
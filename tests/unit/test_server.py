@@ -0,0 +1,214 @@
+"""Tests for the FastAPI server."""
+
+import asyncio
+from pathlib import Path
+
+import httpx
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+from claude_code_search.server.app import create_app
+
+_STATIC_DIR = (
+    Path(__file__).resolve().parents[2] / "src" / "claude_code_search" / "static"
+)
+
+# Read once at import: the shell is compared and probed by several tests,
+# and the file on disk does not change mid-run. Kept as bytes so the
+# assertions scan response.content without a UTF-8 decode per test.
+_INDEX_HTML = (_STATIC_DIR / "index.html").read_bytes()
+
+
+@pytest.fixture(scope="session")
+def client(indexed_search):
+    """One app and client for the whole run; every test here is read-only.
+
+    Route-table construction and dependency wiring happen once instead of
+    per test, on top of the already-shared indexed_search database.
+    """
+    with TestClient(create_app(indexed_search)) as test_client:
+        yield test_client
+
+
+# UI affordances the served shell must carry, checked against one shared
+# fetch of the body instead of one GET per marker.
+_UI_MARKERS = {
+    "search_input": b"Search across all sessions",
+    "session_dropdown": b"All sessions",
+    "role_filter": b"All roles",
+}
+
+
+@pytest.fixture(scope="module")
+def ui_shell(client):
+    return client.get("/").content
+
+
+def _payload(response):
+    """Decode a JSON body with orjson, mirroring the server's encoder."""
+    return orjson.loads(response.content)
+
+
+class TestStaticUI:
+    def test_root_serves_static_html(self, client):
+        response = client.get("/")
+        assert response.status_code == 200
+        assert response.content == _INDEX_HTML
+
+    def test_root_returns_304_for_matching_etag(self, client):
+        etag = client.get("/").headers["etag"]
+        response = client.get("/", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    @pytest.mark.parametrize("marker", _UI_MARKERS.values(), ids=_UI_MARKERS.keys())
+    def test_static_ui_contains_marker(self, ui_shell, marker):
+        assert marker in ui_shell
+
+
+class TestStats:
+    def test_stats_endpoint(self, client, sample_messages):
+        response = client.get("/api/stats")
+        assert response.status_code == 200
+        payload = _payload(response)
+        assert payload["session_count"] == 1
+        assert payload["message_count"] == len(sample_messages)
+
+    def test_stats_returns_304_for_matching_etag(self, client):
+        etag = client.get("/api/stats").headers["etag"]
+        response = client.get("/api/stats", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+
+class TestSessions:
+    def test_sessions_endpoint(self, client):
+        response = client.get("/api/sessions")
+        assert response.status_code == 200
+        payload = _payload(response)
+        assert len(payload) == 1
+        assert payload[0]["session_id"] == "sess-fixture"
+
+    def test_session_detail(self, client):
+        response = client.get("/api/sessions/sess-fixture")
+        assert response.status_code == 200
+        assert _payload(response)["session_id"] == "sess-fixture"
+
+    def test_missing_session_is_404(self, client):
+        response = client.get("/api/sessions/no-such-id")
+        assert response.status_code == 404
+
+
+class TestSearch:
+    def test_search_endpoint(self, client):
+        response = client.get("/api/search", params={"q": "authentication"})
+        assert response.status_code == 200
+        payload = _payload(response)
+        assert payload["total"] > 0
+        assert payload["query"] == "authentication"
+        assert payload["results"][0]["message_id"] == "fix-m0"
+
+    def test_search_groups_interactions(self, client):
+        response = client.get("/api/search", params={"q": "authentication"})
+        payload = _payload(response)
+        assert len(payload["interactions"]) > 0
+        interaction = payload["interactions"][0]
+        assert interaction["session_id"] == "sess-fixture"
+        assert interaction["match_count"] > 0
+
+    def test_search_groups_sessions(self, client):
+        response = client.get("/api/search", params={"q": "pagination"})
+        payload = _payload(response)
+        assert len(payload["sessions"]) == 1
+        assert payload["sessions"][0]["session_id"] == "sess-fixture"
+
+    def test_search_role_filter(self, client):
+        response = client.get("/api/search", params={"q": "pagination", "role": "user"})
+        payload = _payload(response)
+        assert all(r["role"] == "user" for r in payload["results"])
+
+    def test_search_projects_requested_fields(self, client):
+        response = client.get(
+            "/api/search", params={"q": "authentication", "fields": "message_id,role"}
+        )
+        payload = _payload(response)
+        assert set(payload["results"][0]) == {"message_id", "role", "score"}
+
+    def test_search_rejects_unknown_fields(self, client):
+        response = client.get(
+            "/api/search", params={"q": "authentication", "fields": "no_such_column"}
+        )
+        assert response.status_code == 422
+
+    def test_search_requires_query(self, client):
+        response = client.get("/api/search")
+        assert response.status_code == 422
+
+    def test_search_tools_endpoint(self, client):
+        response = client.get("/api/search/tools", params={"q": "rotate"})
+        assert response.status_code == 200
+        payload = _payload(response)
+        assert payload["total"] > 0
+        assert payload["results"][0]["tool_name"] == "Bash"
+
+
+class TestMessages:
+    def test_message_endpoint(self, client):
+        response = client.get("/api/messages/fix-m0")
+        assert response.status_code == 200
+        assert _payload(response)["role"] == "user"
+
+    def test_missing_message_is_404(self, client):
+        response = client.get("/api/messages/no-such-id")
+        assert response.status_code == 404
+
+    def test_message_context(self, client):
+        response = client.get(
+            "/api/messages/fix-m3/context", params={"before": 1, "after": 1}
+        )
+        assert response.status_code == 200
+        payload = _payload(response)
+        context_ids = [m["message_id"] for m in payload["context"]]
+        assert context_ids == ["fix-m2", "fix-m3", "fix-m4"]
+
+
+@pytest.fixture
+def anyio_backend():
+    # asyncio only: the test drives concurrency with asyncio.gather, and
+    # the server itself never runs under trio.
+    return "asyncio"
+
+
+class TestConcurrentAccess:
+    @pytest.mark.anyio
+    async def test_endpoints_serve_concurrently(self, client):
+        # Straight ASGI transport into the shared app: in-flight requests
+        # overlap on one event loop, covering the shared-state paths (search
+        # cache, stats cache) that the serial TestClient tests never race.
+        transport = httpx.ASGITransport(app=client.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://testserver"
+        ) as async_client:
+            stats, search = await asyncio.gather(
+                async_client.get("/api/stats"),
+                async_client.get("/api/search", params={"q": "authentication"}),
+            )
+        assert stats.status_code == 200
+        assert search.status_code == 200
+        assert _payload(search)["total"] > 0
+
+
+class TestExport:
+    def test_export_csv(self, client):
+        response = client.get(
+            "/api/export", params={"q": "authentication", "format": "csv"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert response.text.splitlines()[0].startswith("message_id,")
+
+    def test_export_json(self, client):
+        response = client.get(
+            "/api/export", params={"q": "authentication", "format": "json"}
+        )
+        assert response.status_code == 200
+        assert _payload(response)[0]["message_id"] == "fix-m0"